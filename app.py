@@ -1,7 +1,10 @@
 """
 Universal File Format Converter - Main Entry Point
 """
+import os
+
 from backend.app import app
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    debug = os.environ.get('FLASK_ENV', 'development') == 'development'
+    app.run(debug=debug, threaded=True, host='0.0.0.0', port=5000)
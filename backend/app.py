@@ -2,34 +2,33 @@
 Universal File Format Converter - Backend API
 Flask-based REST API for file conversion
 """
+import base64
+import logging
 import os
+import re
 import sys
-import uuid
+import threading
+import time
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from flask import Flask, request, jsonify, send_file, render_template, after_this_request
+from flask import Flask, Response, request, jsonify, send_file, render_template
 from flask_cors import CORS
+from werkzeug.exceptions import RequestEntityTooLarge
 from werkzeug.utils import secure_filename
 import shutil
-import zipfile
-from apscheduler.schedulers.background import BackgroundScheduler
 
-# Import converters and utilities
+# Import utilities; converters are loaded on first use (see backend.converters.tasks)
+from backend.config import Config
 from backend.utils.file_detector import FileDetector
-from backend.converters.image_converter import ImageConverter
-from backend.converters.document_converter import DocumentConverter
-from backend.converters.pdf_tools import PDFTools
 from backend.utils.session_cleaner import SessionCleaner
+from backend.utils.zip_stream import stream_zip
+from backend.utils.json_provider import ORJSON_AVAILABLE, OrjsonProvider
+from backend.converters import tasks
 
-# Try to import OCR converter (optional)
-try:
-    from backend.converters.ocr_converter import OCRConverter
-    OCR_AVAILABLE = True
-except Exception:
-    OCR_AVAILABLE = False
+logger = logging.getLogger(__name__)
 
 # Get project root directory
 ROOT_DIR = Path(__file__).parent.parent
@@ -39,56 +38,157 @@ app = Flask(__name__,
             template_folder=str(ROOT_DIR / 'frontend' / 'templates'))
 CORS(app)
 
-# Configuration
-app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024  # 50MB max file size
-app.config['UPLOAD_FOLDER'] = ROOT_DIR / 'uploads'
-app.config['OUTPUT_FOLDER'] = ROOT_DIR / 'outputs'
+# Faster JSON (de)serialization when orjson is installed
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
+
+# Configuration (settings snapshot from backend.config; folders resolved against the project root)
+app.config.update(Config.as_dict())
+app.config['UPLOAD_FOLDER'] = ROOT_DIR / Config.UPLOAD_FOLDER
+app.config['OUTPUT_FOLDER'] = ROOT_DIR / Config.OUTPUT_FOLDER
+
+# Hand downloads to a fronting web server (Apache/lighttpd X-Sendfile) when enabled
+app.config['USE_X_SENDFILE'] = os.environ.get('USE_X_SENDFILE') == '1'
+
+# Read/write size used when copying uploads to disk
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+# String roots for per-request path building (avoids Path allocations)
+UPLOAD_ROOT = str(app.config['UPLOAD_FOLDER'])
+OUTPUT_ROOT = str(app.config['OUTPUT_FOLDER'])
+
+# Session IDs issued by _new_session_id (base32) or by earlier releases (uuid4)
+SESSION_ID_RE = re.compile(
+    r'[a-z2-7]{24}|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}'
+)
 
 # Create necessary folders
 app.config['UPLOAD_FOLDER'].mkdir(exist_ok=True)
 app.config['OUTPUT_FOLDER'].mkdir(exist_ok=True)
 
-# Initialize converters
+# Initialize utilities
 file_detector = FileDetector()
-image_converter = ImageConverter()
-document_converter = DocumentConverter()
-pdf_tools = PDFTools()
 session_cleaner = SessionCleaner(
     app.config['UPLOAD_FOLDER'],
     app.config['OUTPUT_FOLDER'],
     max_age_hours=2  # 2 hours - balance between redownload availability and storage
 )
 
-if OCR_AVAILABLE:
+# Supported formats never change while the process runs; serialize them once
+FORMATS_JSON = app.json.dumps({
+    'success': True,
+    'formats': file_detector.get_supported_formats()
+})
+
+# File-picker filter for index.html, built from the same table so the two cannot drift
+UPLOAD_ACCEPT = ','.join(
+    f'.{ext}' for exts in file_detector.get_supported_formats().values() for ext in exts
+)
+
+# Automatic cleanup interval
+CLEANUP_INTERVAL_SECONDS = 30 * 60  # Run cleanup every 30 minutes
+
+
+def _schedule_cleanup():
+    """Arm a daemon timer for the next cleanup run"""
+    timer = threading.Timer(CLEANUP_INTERVAL_SECONDS, _periodic_cleanup)
+    timer.daemon = True
+    timer.start()
+
+
+def _periodic_cleanup():
+    """Remove expired sessions, then schedule the next run"""
     try:
-        ocr_converter = OCRConverter()
+        session_cleaner.cleanup_old_sessions()
     except Exception:
-        OCR_AVAILABLE = False
-
-# Setup automatic cleanup scheduler
-scheduler = BackgroundScheduler()
-scheduler.add_job(
-    func=session_cleaner.cleanup_old_sessions,
-    trigger="interval",
-    minutes=30,  # Run cleanup every 30 minutes
-    id='session_cleanup'
-)
-scheduler.start()
+        logger.exception("Periodic session cleanup failed")
+    finally:
+        _schedule_cleanup()
+
+
+# ENABLE_SCHEDULER=0 turns automatic cleanup off (e.g. for short-lived workers)
+CLEANUP_SCHEDULER_ENABLED = os.environ.get('ENABLE_SCHEDULER', '1') == '1'
+
+_cleanup_scheduled = False
+_cleanup_scheduled_lock = threading.Lock()
+
+
+@app.before_request
+def _start_cleanup_scheduler():
+    """
+    Arm the cleanup timer on the first request this process serves
+    
+    Pool workers re-import this module and the Werkzeug reloader imports it
+    in its watcher process, but neither serves requests, so only serving
+    processes end up running the timer
+    """
+    global _cleanup_scheduled
+    
+    if _cleanup_scheduled or not CLEANUP_SCHEDULER_ENABLED:
+        return
+    with _cleanup_scheduled_lock:
+        if _cleanup_scheduled:
+            return
+        _cleanup_scheduled = True
+    _schedule_cleanup()
 
 
 @app.route('/')
 def index():
     """Serve the main page"""
-    return render_template('index.html')
+    return render_template('index.html', upload_accept=UPLOAD_ACCEPT)
 
 
 @app.route('/api/formats', methods=['GET'])
 def get_formats():
     """Get all supported formats"""
-    formats = file_detector.get_supported_formats()
+    return Response(
+        FORMATS_JSON,
+        mimetype='application/json',
+        headers={'Cache-Control': 'public, max-age=86400'}
+    )
+
+
+def _new_session_id():
+    """Return a random 24-character, URL- and filesystem-safe session ID"""
+    return base64.b32encode(os.urandom(15)).decode('ascii').lower()
+
+
+def _valid_session_id(session_id):
+    """Check a client-supplied session ID before it is used in a path"""
+    return isinstance(session_id, str) and SESSION_ID_RE.fullmatch(session_id) is not None
+
+
+def _session_path(root, session_id, safe_name):
+    """Build the path of a file inside a session folder (safe_name is already secure_filename()'d)"""
+    return os.path.join(root, session_id, safe_name)
+
+
+def _save_stream(stream, filepath):
+    """Write an upload stream to disk in fixed-size chunks"""
+    with open(filepath, 'wb') as f:
+        while True:
+            chunk = stream.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            f.write(chunk)
+
+
+def _detection_response(session_id, filename, filepath):
+    """Detect a saved upload and build the JSON payload returned to the client"""
+    # Detect format
+    format_type, file_format = file_detector.detect_format(filepath)
+    
+    # Get available conversion targets
+    targets = file_detector.get_conversion_targets(format_type, file_format)
+    
     return jsonify({
         'success': True,
-        'formats': formats
+        'session_id': session_id,
+        'filename': filename,
+        'detected_type': format_type,
+        'detected_format': file_format,
+        'available_targets': targets
     })
 
 
@@ -102,32 +202,54 @@ def detect_format():
     if file.filename == '':
         return jsonify({'success': False, 'error': 'Empty filename'}), 400
     
+    if not Config.is_allowed(file.filename):
+        return jsonify({'success': False, 'error': 'Unsupported file type'}), 400
+    
     try:
         # Save temporarily
-        session_id = str(uuid.uuid4())
-        session_folder = app.config['UPLOAD_FOLDER'] / session_id
-        session_folder.mkdir(exist_ok=True)
+        session_id = _new_session_id()
+        session_folder = os.path.join(UPLOAD_ROOT, session_id)
+        os.makedirs(session_folder, exist_ok=True)
         
         filename = secure_filename(file.filename)
-        filepath = session_folder / filename
-        file.save(filepath)
+        filepath = os.path.join(session_folder, filename)
+        # Copy out of Werkzeug's spooled temp file in 1MB steps (default is 16KB)
+        file.save(filepath, buffer_size=UPLOAD_CHUNK_SIZE)
         
-        # Detect format
-        format_type, file_format = file_detector.detect_format(str(filepath))
+        return _detection_response(session_id, filename, filepath)
+    
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/detect/<filename>', methods=['PUT'])
+def detect_format_stream(filename):
+    """Detect file format from a raw request body (no multipart parsing)"""
+    filename = secure_filename(filename)
+    if not filename:
+        return jsonify({'success': False, 'error': 'Empty filename'}), 400
+    
+    if not Config.is_allowed(filename):
+        return jsonify({'success': False, 'error': 'Unsupported file type'}), 400
+    
+    session_id = _new_session_id()
+    session_folder = os.path.join(UPLOAD_ROOT, session_id)
+    
+    try:
+        # Stream the body straight into the session folder
+        os.makedirs(session_folder, exist_ok=True)
         
-        # Get available conversion targets
-        targets = file_detector.get_conversion_targets(format_type, file_format)
+        filepath = os.path.join(session_folder, filename)
+        _save_stream(request.stream, filepath)
         
-        return jsonify({
-            'success': True,
-            'session_id': session_id,
-            'filename': filename,
-            'detected_type': format_type,
-            'detected_format': file_format,
-            'available_targets': targets
-        })
+        return _detection_response(session_id, filename, filepath)
     
+    except RequestEntityTooLarge:
+        # Drop the partial upload and let the 413 handler respond
+        shutil.rmtree(session_folder, ignore_errors=True)
+        raise
     except Exception as e:
+        shutil.rmtree(session_folder, ignore_errors=True)
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
@@ -149,38 +271,42 @@ def convert_file():
     if not all([session_id, filename, target_format]):
         return jsonify({'success': False, 'error': 'Missing required fields'}), 400
     
+    if not _valid_session_id(session_id):
+        return jsonify({'success': False, 'error': 'Invalid session ID'}), 400
+    
     try:
         # Locate input file
-        input_path = app.config['UPLOAD_FOLDER'] / session_id / secure_filename(filename)
+        safe_name = secure_filename(filename)
+        input_path = _session_path(UPLOAD_ROOT, session_id, safe_name)
         
-        if not input_path.exists():
+        if not os.path.exists(input_path):
             return jsonify({'success': False, 'error': 'File not found'}), 404
         
-        # Detect format type
-        format_type, _ = file_detector.detect_format(str(input_path))
+        # Detect format type (usually cached from /api/detect)
+        format_type, _ = file_detector.detect_format(input_path)
+        
+        convert_task = tasks.CONVERTER_TASKS.get(format_type)
+        if convert_task is None:
+            return jsonify({'success': False, 'error': 'Unsupported format type'}), 400
         
         # Prepare output path
-        output_folder = app.config['OUTPUT_FOLDER'] / session_id
-        output_folder.mkdir(exist_ok=True)
+        output_folder = os.path.join(OUTPUT_ROOT, session_id)
+        os.makedirs(output_folder, exist_ok=True)
         
-        base_name = Path(filename).stem
+        base_name = Path(safe_name).stem
         output_filename = secure_filename(f"{base_name}.{target_format.lower()}") or f"{base_name}.{target_format.lower()}"
-        output_path = output_folder / output_filename
+        output_path = os.path.join(output_folder, output_filename)
         
         # Convert
-        if format_type == 'image':
-            image_converter.convert(
-                str(input_path), 
-                str(output_path), 
-                target_format.lower(),
-                quality=quality,
-                max_width=max_width,
-                max_height=max_height
-            )
-        elif format_type == 'document':
-            document_converter.convert(str(input_path), str(output_path), target_format.lower())
-        else:
-            return jsonify({'success': False, 'error': 'Unsupported format type'}), 400
+        tasks.run(
+            convert_task,
+            input_path,
+            output_path,
+            target_format.lower(),
+            quality=quality,
+            max_width=max_width,
+            max_height=max_height
+        )
         
         return jsonify({
             'success': True,
@@ -195,16 +321,34 @@ def convert_file():
 @app.route('/api/download/<session_id>/<filename>', methods=['GET'])
 def download_file(session_id, filename):
     """Download converted file"""
+    if not _valid_session_id(session_id):
+        return jsonify({'success': False, 'error': 'Invalid session ID'}), 400
+    
     try:
-        file_path = app.config['OUTPUT_FOLDER'] / session_id / secure_filename(filename)
+        safe_name = secure_filename(filename)
+        file_path = _session_path(OUTPUT_ROOT, session_id, safe_name)
         
-        if not file_path.exists():
+        try:
+            st = os.stat(file_path)
+        except FileNotFoundError:
             return jsonify({'success': False, 'error': 'File not found'}), 404
         
+        # Revalidation from the same stat: answer 304 without opening the file
+        etag = f"{st.st_ino:x}-{st.st_mtime_ns:x}-{st.st_size:x}"
+        if request.if_none_match.contains(etag):
+            response = app.response_class(status=304)
+            response.set_etag(etag)
+            return response
+        
+        # send_file serves through wsgi.file_wrapper (sendfile under gunicorn)
+        # or an X-Sendfile header, so the body is not copied through Python;
+        # it also answers Range and If-Modified-Since requests
         return send_file(
             file_path,
             as_attachment=True,
-            download_name=filename
+            download_name=filename,
+            etag=etag,
+            last_modified=st.st_mtime
         )
     
     except Exception as e:
@@ -214,120 +358,87 @@ def download_file(session_id, filename):
 @app.route('/api/download-batch', methods=['POST'])
 def download_batch():
     """Download multiple files as a ZIP archive"""
-    zip_path = None
     try:
         data = request.get_json()
-        print(f"[BATCH DOWNLOAD] Received request with data: {data}")
+        logger.debug("[BATCH DOWNLOAD] Received request with data: %s", data)
         
         if not data:
             return jsonify({'success': False, 'error': 'No data provided'}), 400
         
         files_info = data.get('files', [])
-        print(f"[BATCH DOWNLOAD] Files to process: {len(files_info)}")
+        logger.debug("[BATCH DOWNLOAD] Files to process: %d", len(files_info))
         
         if not files_info:
             return jsonify({'success': False, 'error': 'No files specified'}), 400
         
-        # Create a temporary ZIP file
-        import time
-        
         timestamp = int(time.time())
         zip_filename = f'converted_files_{timestamp}.zip'
-        zip_path = app.config['OUTPUT_FOLDER'] / zip_filename
-        print(f"[BATCH DOWNLOAD] Creating ZIP at: {zip_path}")
         
-        # Create ZIP archive
-        files_added = 0
+        # Resolve members up front so a batch with nothing to send can still 404
+        members = []
         missing_files = []
-        with zipfile.ZipFile(str(zip_path), 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for file_info in files_info:
-                session_id = file_info.get('session_id')
-                filename = file_info.get('filename')
-                
-                if not session_id or not filename:
-                    print(f"[BATCH DOWNLOAD] Skipping invalid file info: {file_info}")
-                    continue
-                
-                file_path = app.config['OUTPUT_FOLDER'] / session_id / secure_filename(filename)
-                print(f"[BATCH DOWNLOAD] Looking for: {file_path}")
-                
-                if file_path.exists():
-                    # Add file to ZIP with just the filename (no session path)
-                    zipf.write(str(file_path), arcname=filename)
-                    files_added += 1
-                    print(f"[BATCH DOWNLOAD] Added: {filename}")
-                else:
-                    missing_files.append(str(file_path))
-                    print(f"[BATCH DOWNLOAD] Missing: {file_path}")
-        
-        print(f"[BATCH DOWNLOAD] Files added: {files_added}, Missing: {len(missing_files)}")
+        for file_info in files_info:
+            session_id = file_info.get('session_id')
+            filename = file_info.get('filename')
+            
+            if not session_id or not filename:
+                logger.debug("[BATCH DOWNLOAD] Skipping invalid file info: %s", file_info)
+                continue
+            
+            if not _valid_session_id(session_id):
+                missing_files.append(filename)
+                logger.debug("[BATCH DOWNLOAD] Invalid session ID: %s", session_id)
+                continue
+            
+            safe_name = secure_filename(filename)
+            file_path = _session_path(OUTPUT_ROOT, session_id, safe_name)
+            logger.debug("[BATCH DOWNLOAD] Looking for: %s", file_path)
+            
+            if os.path.exists(file_path):
+                # Add file to ZIP with just the filename (no session path)
+                members.append((file_path, safe_name))
+                logger.debug("[BATCH DOWNLOAD] Added: %s", safe_name)
+            else:
+                missing_files.append(filename)
+                logger.debug("[BATCH DOWNLOAD] Missing: %s", file_path)
+        
+        logger.debug("[BATCH DOWNLOAD] Files added: %d, Missing: %d", len(members), len(missing_files))
         
         # Check if any files were added
-        if files_added == 0:
-            if zip_path.exists():
-                zip_path.unlink()
+        if not members:
             error_msg = f'No files found to download. Missing files: {missing_files}'
-            print(f"[BATCH DOWNLOAD] ERROR: {error_msg}")
+            logger.debug("[BATCH DOWNLOAD] ERROR: %s", error_msg)
             return jsonify({'success': False, 'error': error_msg}), 404
         
-        # Get ZIP file size
-        zip_size = zip_path.stat().st_size
-        print(f"[BATCH DOWNLOAD] ZIP created successfully: {zip_size} bytes")
-        
-        # Send the ZIP file using send_file with as_attachment
-        # Flask will handle file closing properly
-        print(f"[BATCH DOWNLOAD] Sending file...")
-        
-        @after_this_request
-        def cleanup_zip(response):
-            """Cleanup ZIP file after response is sent"""
-            def remove_file(path):
-                try:
-                    import time
-                    time.sleep(1)  # Give time for download to start
-                    if path.exists():
-                        path.unlink()
-                        print(f"[BATCH DOWNLOAD] Cleaned up ZIP file: {path}")
-                except Exception as e:
-                    print(f"[BATCH DOWNLOAD] Cleanup error: {e}")
-            
-            import threading
-            threading.Thread(target=remove_file, args=(zip_path,)).start()
-            return response
-        
-        return send_file(
-            str(zip_path),
-            as_attachment=True,
-            download_name=zip_filename,
-            mimetype='application/zip'
+        # Stream the archive as it is built; nothing is written to disk
+        logger.debug("[BATCH DOWNLOAD] Streaming ZIP: %s", zip_filename)
+        return Response(
+            stream_zip(members),
+            mimetype='application/zip',
+            headers={'Content-Disposition': f'attachment; filename={zip_filename}'}
         )
     
     except Exception as e:
-        import traceback
-        error_trace = traceback.format_exc()
-        print(f"[BATCH DOWNLOAD] EXCEPTION: {e}")
-        print(f"[BATCH DOWNLOAD] Traceback:\n{error_trace}")
-        
-        # Clean up ZIP file on error
-        if zip_path and zip_path.exists():
-            try:
-                zip_path.unlink()
-            except Exception:
-                pass
+        logger.exception("[BATCH DOWNLOAD] Batch download failed")
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
 @app.route('/api/cleanup/<session_id>', methods=['DELETE', 'POST'])
 def cleanup_session(session_id):
     """Clean up session files (supports both DELETE and POST for sendBeacon)"""
+    if not _valid_session_id(session_id):
+        return jsonify({'success': False, 'error': 'Invalid session ID'}), 400
+    
     try:
-        upload_folder = app.config['UPLOAD_FOLDER'] / session_id
-        output_folder = app.config['OUTPUT_FOLDER'] / session_id
+        upload_folder = os.path.join(UPLOAD_ROOT, session_id)
+        output_folder = os.path.join(OUTPUT_ROOT, session_id)
+        
+        file_detector.forget(upload_folder)
         
-        if upload_folder.exists():
+        if os.path.exists(upload_folder):
             shutil.rmtree(upload_folder)
         
-        if output_folder.exists():
+        if os.path.exists(output_folder):
             shutil.rmtree(output_folder)
         
         return jsonify({'success': True, 'message': 'Session cleaned up'})
@@ -353,25 +464,29 @@ def compress_image():
     if not all([session_id, filename]):
         return jsonify({'success': False, 'error': 'Missing required fields'}), 400
     
+    if not _valid_session_id(session_id):
+        return jsonify({'success': False, 'error': 'Invalid session ID'}), 400
+    
     try:
         # Locate input file
-        input_path = app.config['UPLOAD_FOLDER'] / session_id / secure_filename(filename)
+        safe_name = secure_filename(filename)
+        input_path = _session_path(UPLOAD_ROOT, session_id, safe_name)
         
-        if not input_path.exists():
+        if not os.path.exists(input_path):
             return jsonify({'success': False, 'error': 'File not found'}), 404
         
         # Prepare output path
-        output_folder = app.config['OUTPUT_FOLDER'] / session_id
-        output_folder.mkdir(exist_ok=True)
+        output_folder = os.path.join(OUTPUT_ROOT, session_id)
+        os.makedirs(output_folder, exist_ok=True)
         
-        base_name = Path(filename).stem
-        output_filename = secure_filename(f"{base_name}_compressed.jpg") or f"{base_name}_compressed.jpg"
-        output_path = output_folder / output_filename
+        base_name = Path(safe_name).stem
+        output_filename = f"{base_name}_compressed.jpg"
+        output_path = os.path.join(output_folder, output_filename)
         
         # Compress
-        result = image_converter.compress_image(
-            str(input_path),
-            str(output_path),
+        result = tasks.get_image_converter().compress_image(
+            input_path,
+            output_path,
             quality=quality,
             max_width=max_width,
             max_height=max_height
@@ -399,29 +514,48 @@ def merge_pdfs():
         return jsonify({'success': False, 'error': 'No data provided'}), 400
     
     files = data.get('files')  # List of {session_id, filename}
-    output_session_id = data.get('output_session_id', str(uuid.uuid4()))
+    output_session_id = data.get('output_session_id') or _new_session_id()
     
     if not files or len(files) < 2:
         return jsonify({'success': False, 'error': 'At least 2 files required'}), 400
     
+    if not _valid_session_id(output_session_id) or not all(
+        _valid_session_id(file_info.get('session_id')) for file_info in files
+    ):
+        return jsonify({'success': False, 'error': 'Invalid session ID'}), 400
+    
     try:
-        # Collect input paths
-        input_paths = []
-        for file_info in files:
-            input_path = app.config['UPLOAD_FOLDER'] / file_info['session_id'] / secure_filename(file_info['filename'])
-            if not input_path.exists():
-                return jsonify({'success': False, 'error': f"File not found: {file_info['filename']}"}), 404
-            input_paths.append(str(input_path))
+        # Collect input paths, checking existence with one directory listing
+        # per session instead of one stat() per file
+        inputs = [(file_info['session_id'], secure_filename(file_info['filename'])) for file_info in files]
+        
+        existing = {}
+        for session_id in {session_id for session_id, _ in inputs}:
+            try:
+                with os.scandir(os.path.join(UPLOAD_ROOT, session_id)) as entries:
+                    existing[session_id] = {entry.name for entry in entries}
+            except FileNotFoundError:
+                existing[session_id] = set()
+        
+        missing = [
+            file_info['filename']
+            for file_info, (session_id, safe_name) in zip(files, inputs)
+            if safe_name not in existing[session_id]
+        ]
+        if missing:
+            return jsonify({'success': False, 'error': f"File not found: {', '.join(missing)}"}), 404
+        
+        input_paths = [_session_path(UPLOAD_ROOT, session_id, safe_name) for session_id, safe_name in inputs]
         
         # Prepare output path
-        output_folder = app.config['OUTPUT_FOLDER'] / output_session_id
-        output_folder.mkdir(exist_ok=True)
+        output_folder = os.path.join(OUTPUT_ROOT, output_session_id)
+        os.makedirs(output_folder, exist_ok=True)
         
         output_filename = 'merged.pdf'
-        output_path = output_folder / output_filename
+        output_path = os.path.join(output_folder, output_filename)
         
         # Merge
-        result = pdf_tools.merge_pdfs(input_paths, str(output_path))
+        result = tasks.get_pdf_tools().merge_pdfs(input_paths, output_path)
         
         return jsonify({
             'success': True,
@@ -451,24 +585,28 @@ def split_pdf():
     if not all([session_id, filename]):
         return jsonify({'success': False, 'error': 'Missing required fields'}), 400
     
+    if not _valid_session_id(session_id):
+        return jsonify({'success': False, 'error': 'Invalid session ID'}), 400
+    
     try:
         # Locate input file
-        input_path = app.config['UPLOAD_FOLDER'] / session_id / secure_filename(filename)
+        safe_name = secure_filename(filename)
+        input_path = _session_path(UPLOAD_ROOT, session_id, safe_name)
         
-        if not input_path.exists():
+        if not os.path.exists(input_path):
             return jsonify({'success': False, 'error': 'File not found'}), 404
         
         # Prepare output directory
-        output_folder = app.config['OUTPUT_FOLDER'] / session_id
-        output_folder.mkdir(exist_ok=True)
+        output_folder = os.path.join(OUTPUT_ROOT, session_id)
+        os.makedirs(output_folder, exist_ok=True)
         
         # Split
-        result = pdf_tools.split_pdf(str(input_path), str(output_folder), mode=mode, pages=pages)
+        result = tasks.get_pdf_tools().split_pdf(input_path, output_folder, mode=mode, pages=pages)
         
         # Generate download URLs
         download_urls = []
         for output_file in result['output_files']:
-            file_name = Path(output_file).name
+            file_name = os.path.basename(output_file)
             download_urls.append({
                 'filename': file_name,
                 'url': f'/api/download/{session_id}/{file_name}'
@@ -488,13 +626,17 @@ def split_pdf():
 @app.route('/api/pdf/info/<session_id>/<filename>', methods=['GET'])
 def get_pdf_info(session_id, filename):
     """Get PDF file information"""
+    if not _valid_session_id(session_id):
+        return jsonify({'success': False, 'error': 'Invalid session ID'}), 400
+    
     try:
-        file_path = app.config['UPLOAD_FOLDER'] / session_id / secure_filename(filename)
+        safe_name = secure_filename(filename)
+        file_path = _session_path(UPLOAD_ROOT, session_id, safe_name)
         
-        if not file_path.exists():
+        if not os.path.exists(file_path):
             return jsonify({'success': False, 'error': 'File not found'}), 404
         
-        info = pdf_tools.get_pdf_info(str(file_path))
+        info = tasks.get_pdf_tools().get_pdf_info(file_path)
         
         return jsonify({
             'success': True,
@@ -521,21 +663,26 @@ def pdf_to_images():
     if not all([session_id, filename]):
         return jsonify({'success': False, 'error': 'Missing required fields'}), 400
     
+    if not _valid_session_id(session_id):
+        return jsonify({'success': False, 'error': 'Invalid session ID'}), 400
+    
     try:
         # Locate input file
-        input_path = app.config['UPLOAD_FOLDER'] / session_id / secure_filename(filename)
+        safe_name = secure_filename(filename)
+        input_path = _session_path(UPLOAD_ROOT, session_id, safe_name)
         
-        if not input_path.exists():
+        if not os.path.exists(input_path):
             return jsonify({'success': False, 'error': 'File not found'}), 404
         
         # Prepare output directory
-        output_folder = app.config['OUTPUT_FOLDER'] / session_id
-        output_folder.mkdir(exist_ok=True)
+        output_folder = os.path.join(OUTPUT_ROOT, session_id)
+        os.makedirs(output_folder, exist_ok=True)
         
         # Convert
-        result = pdf_tools.pdf_to_images(
-            str(input_path),
-            str(output_folder),
+        result = tasks.run(
+            tasks.pdf_to_images,
+            input_path,
+            output_folder,
             format=format,
             dpi=dpi
         )
@@ -543,7 +690,7 @@ def pdf_to_images():
         # Generate download URLs
         download_urls = []
         for output_file in result['output_files']:
-            file_name = Path(output_file).name
+            file_name = os.path.basename(output_file)
             download_urls.append({
                 'filename': file_name,
                 'url': f'/api/download/{session_id}/{file_name}'
@@ -564,9 +711,9 @@ def pdf_to_images():
 @app.route('/api/ocr', methods=['POST'])
 def ocr_extract():
     """Perform OCR on image or PDF"""
-    if not OCR_AVAILABLE:
+    if tasks.get_ocr_converter() is None:
         return jsonify({
-            'success': False, 
+            'success': False,
             'error': 'OCR not available. Install pytesseract and pdf2image.'
         }), 503
     
@@ -583,25 +730,30 @@ def ocr_extract():
     if not all([session_id, filename]):
         return jsonify({'success': False, 'error': 'Missing required fields'}), 400
     
+    if not _valid_session_id(session_id):
+        return jsonify({'success': False, 'error': 'Invalid session ID'}), 400
+    
     try:
         # Locate input file
-        input_path = app.config['UPLOAD_FOLDER'] / session_id / secure_filename(filename)
+        safe_name = secure_filename(filename)
+        input_path = _session_path(UPLOAD_ROOT, session_id, safe_name)
         
-        if not input_path.exists():
+        if not os.path.exists(input_path):
             return jsonify({'success': False, 'error': 'File not found'}), 404
         
         # Prepare output path
-        output_folder = app.config['OUTPUT_FOLDER'] / session_id
-        output_folder.mkdir(exist_ok=True)
+        output_folder = os.path.join(OUTPUT_ROOT, session_id)
+        os.makedirs(output_folder, exist_ok=True)
         
-        base_name = Path(filename).stem
-        output_filename = secure_filename(f"{base_name}_ocr.txt") or f"{base_name}_ocr.txt"
-        output_path = output_folder / output_filename
+        base_name = Path(safe_name).stem
+        output_filename = f"{base_name}_ocr.txt"
+        output_path = os.path.join(output_folder, output_filename)
         
         # Perform OCR
-        result = ocr_converter.ocr_to_text_file(
-            str(input_path),
-            str(output_path),
+        result = tasks.run(
+            tasks.ocr_to_text_file,
+            input_path,
+            output_path,
             file_type=file_type,
             lang=lang
         )
@@ -621,7 +773,8 @@ def ocr_extract():
 @app.route('/api/ocr/languages', methods=['GET'])
 def get_ocr_languages():
     """Get available OCR languages"""
-    if not OCR_AVAILABLE:
+    ocr_converter = tasks.get_ocr_converter()
+    if ocr_converter is None:
         return jsonify({'success': False, 'error': 'OCR not available'}), 503
     
     try:
@@ -679,4 +832,5 @@ def internal_error(e):
 
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    debug = os.environ.get('FLASK_ENV', 'development') == 'development'
+    app.run(debug=debug, threaded=True, host='0.0.0.0', port=5000)
@@ -1,19 +1,58 @@
 # Run with: python app.py
 
-import os
+from os import environ
+import re
+from types import MappingProxyType
+
+# Environment is read once at import; everything below reuses these values
+_SECRET_KEY = environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
+
+# Maximum upload size in bytes (50MB)
+MAX_CONTENT_LENGTH = 52_428_800
+
+# Allowed file extensions (modern formats only, pure Python support)
+ALLOWED_EXTENSIONS = frozenset({
+    'pdf', 'docx', 'xlsx', 'xlsm', 'txt', 'md', 'csv',
+    'png', 'jpg', 'jpeg', 'bmp', 'tiff', 'gif', 'webp', 'ico'
+})
+
+# Single compiled check for "filename ends with an allowed extension"
+ALLOWED_EXT_RE = re.compile(
+    r'\.(?:' + '|'.join(sorted(ALLOWED_EXTENSIONS)) + r')\Z',
+    re.IGNORECASE
+)
+
+def _uppercase_settings(cls):
+    """Collect UPPERCASE attributes along the MRO (what Flask's from_object copies)"""
+    settings = {}
+    for klass in reversed(cls.__mro__):
+        settings.update((key, value) for key, value in vars(klass).items() if key.isupper())
+    return settings
 
 class Config:
     """Base configuration"""
-    SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
-    MAX_CONTENT_LENGTH = 50 * 1024 * 1024  # 50MB
+    SECRET_KEY = _SECRET_KEY
+    MAX_CONTENT_LENGTH = MAX_CONTENT_LENGTH
     UPLOAD_FOLDER = 'uploads'
     OUTPUT_FOLDER = 'outputs'
+    ALLOWED_EXTENSIONS = ALLOWED_EXTENSIONS
     
-    # Allowed file extensions (modern formats only, pure Python support)
-    ALLOWED_EXTENSIONS = {
-        'pdf', 'docx', 'xlsx', 'xlsm', 'txt', 'md', 'csv',
-        'png', 'jpg', 'jpeg', 'bmp', 'tiff', 'gif', 'webp', 'ico'
-    }
+    @staticmethod
+    def is_allowed(filename):
+        """Check whether filename has an allowed extension (case-insensitive)"""
+        return ALLOWED_EXT_RE.search(filename) is not None
+    
+    def __init_subclass__(cls, **kwargs):
+        """Snapshot each subclass's settings once, when the class is created"""
+        super().__init_subclass__(**kwargs)
+        cls._settings = _uppercase_settings(cls)
+    
+    @classmethod
+    def as_dict(cls):
+        """Return the cached settings; use app.config.update(cls.as_dict()) instead of from_object"""
+        return cls._settings
+
+Config._settings = _uppercase_settings(Config)
 
 class DevelopmentConfig(Config):
     """Development configuration"""
@@ -30,10 +69,12 @@ class TestingConfig(Config):
     DEBUG = True
     TESTING = True
 
-# Configuration dictionary
-config = {
-    'development': DevelopmentConfig,
-    'production': ProductionConfig,
-    'testing': TestingConfig,
-    'default': DevelopmentConfig
+# Configuration mapping: one ready-to-use instance per environment, read-only
+_CONFIG_INSTANCES = {
+    'development': DevelopmentConfig(),
+    'production': ProductionConfig(),
+    'testing': TestingConfig()
 }
+_CONFIG_INSTANCES['default'] = _CONFIG_INSTANCES['development']
+
+config = MappingProxyType(_CONFIG_INSTANCES)
@@ -4,20 +4,252 @@ Handles conversions between Word, Excel, PDF, and plain text formats
 Pure Python implementation - no external dependencies
 """
 import os
+import re
 import csv
+import codecs
+from concurrent.futures import ProcessPoolExecutor
+from functools import cached_property, lru_cache
+import logging
+import multiprocessing
 import shutil
+import sys
 import tempfile
-from pathlib import Path
-from docx import Document
-from openpyxl import load_workbook, Workbook
-from PyPDF2 import PdfReader, PdfWriter
-from pdf2docx import Converter as PDFConverter
-from PIL import Image
-import img2pdf
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.pdfgen import canvas
-from reportlab.lib.utils import ImageReader
-import io
+import threading
+
+from backend.utils.pixmap import save_jpeg
+from backend.utils.readahead import prefetch
+
+# Heavy libraries (python-docx, openpyxl, pypdf, pdf2docx, reportlab) are
+# imported inside the methods that use them, so a plain copy or a pool worker
+# only loads what its conversion needs
+
+logger = logging.getLogger(__name__)
+
+
+# Markdown inline tokens for _parse_md_inline, matched in one scan:
+# 1 = ***bold italic***, 2 = **bold**, 3 = *italic* (not space-padded),
+# 4 = plain text (including a `code span`, kept literal with its backticks,
+#     and a stray '*' or '`' that opens no span)
+_MD_INLINE = re.compile(r'\*\*\*(.+?)\*\*\*|\*\*(.+?)\*\*|\*([^*\s](?:[^*]*?[^*\s])?)\*|(`[^`]*`|[^*`]+|[*`])')
+
+# Run formatting (bold, italic) per _MD_INLINE group
+_MD_INLINE_STYLE = {1: (True, True), 2: (True, False), 3: (False, True)}
+
+# Word heading style names, reduced to their 'Heading N' prefix
+_DOCX_HEADING = re.compile(r'Heading \d')
+
+# reportlab Paragraph markup escaping, done in one pass
+_XML_ESCAPE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;'})
+
+# CSV input encodings, tried in order
+CSV_ENCODINGS = ('utf-8-sig', 'utf-8', 'gbk', 'big5', 'latin1')
+
+# Numeric CSV cells: integers, or decimals with an optional exponent
+# (the forms int()/float() accepted in _csv_to_excel's coercion)
+_NUM_RE = re.compile(r'\s*[+-]?(?:\d+|(?:\d+\.\d*|\.\d+)(?:[eE][+-]?\d+)?)\s*')
+
+# Bytes sampled to rule out encodings before reading a whole file
+ENCODING_PROBE_SIZE = 64 * 1024
+
+
+def _cell_text(value):
+    """Spreadsheet cell value as display text (empty cells become '')"""
+    return '' if value is None else str(value)
+
+
+def _candidate_encodings(input_path, encodings=CSV_ENCODINGS):
+    """Yield the encodings that can decode the start of the file, in preference order"""
+    with open(input_path, 'rb') as f:
+        probe = f.read(ENCODING_PROBE_SIZE)
+    
+    for encoding in encodings:
+        try:
+            # Incremental decode: a multibyte character cut at the probe
+            # boundary is not an error
+            codecs.getincrementaldecoder(encoding)().decode(probe, final=False)
+        except UnicodeDecodeError:
+            continue
+        yield encoding
+
+
+def _docx_style_name(para, cache):
+    """
+    Return para.style.name, memoized per document by the paragraph's style id
+    
+    python-docx resolves every para.style by scanning all of styles.xml (for
+    the default style, attribute by attribute), which made style lookup the
+    bulk of the per-paragraph cost on plain documents.
+    """
+    # w:pStyle value straight from the paragraph properties; None means the default style
+    p_pr = para._p.pPr
+    style_id = p_pr.pStyle.val if p_pr is not None and p_pr.pStyle is not None else None
+    if style_id not in cache:
+        style = para.style
+        cache[style_id] = style.name if style else ''
+    return cache[style_id]
+
+
+# Write buffer for text outputs; large buffer = few write() syscalls
+TEXT_WRITE_BUFFER = 1024 * 1024  # 1MB
+
+
+def _write_joined(output_path, parts, separator):
+    """Write separator.join(parts) to a UTF-8 file without building the joined string"""
+    with open(output_path, 'w', encoding='utf-8', buffering=TEXT_WRITE_BUFFER) as f:
+        first = True
+        for part in parts:
+            if not first:
+                f.write(separator)
+            f.write(part)
+            first = False
+
+
+@lru_cache(maxsize=None)
+def _docx2pdf_convert():
+    """
+    Return docx2pdf.convert, or None when it cannot work here
+    
+    docx2pdf drives Microsoft Word, so it only runs on Windows and macOS.
+    Probed once per process instead of failing (and logging) per file.
+    """
+    if sys.platform not in ('win32', 'darwin'):
+        return None
+    try:
+        from docx2pdf import convert
+        return convert
+    except ImportError:
+        return None
+
+
+# reportlab styles are built on first use (reportlab itself is imported
+# lazily) and then shared by every conversion in the process
+
+@lru_cache(maxsize=None)
+def _md_pdf_styles():
+    """Return (sample stylesheet, heading style per level 1-6) for _text_to_pdf"""
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    
+    styles = getSampleStyleSheet()
+    heading_styles = {}
+    for i in range(1, 7):
+        heading_styles[i] = ParagraphStyle(
+            f'MDHeading{i}',
+            parent=styles['Heading1'],
+            fontSize=24 - (i * 2),
+            spaceAfter=12,
+            spaceBefore=12
+        )
+    return styles, heading_styles
+
+
+@lru_cache(maxsize=None)
+def _docx_table_style():
+    """TableStyle for Word tables in _word_to_pdf_manual"""
+    from reportlab.lib import colors
+    from reportlab.platypus import TableStyle
+    
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 9),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+        ('BOX', (0, 0), (-1, -1), 1, colors.black),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
+        ('TOPPADDING', (0, 0), (-1, -1), 6),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+        ('LEFTPADDING', (0, 0), (-1, -1), 8),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ])
+
+
+@lru_cache(maxsize=None)
+def _sheet_table_style():
+    """TableStyle for Excel/CSV tables in _table_to_pdf"""
+    from reportlab.lib import colors
+    from reportlab.platypus import TableStyle
+    
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 8),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
+        ('TOPPADDING', (0, 0), (-1, -1), 6),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+        ('LEFTPADDING', (0, 0), (-1, -1), 6),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ])
+
+
+@lru_cache(maxsize=None)
+def _sheet_cell_styles():
+    """Return (header, body) ParagraphStyles for wrapped cells in _table_to_pdf"""
+    from reportlab.lib import colors
+    from reportlab.lib.styles import ParagraphStyle
+    
+    header_style = ParagraphStyle(
+        'SheetHeader',
+        fontName='Helvetica-Bold',
+        fontSize=10,
+        leading=12,
+        textColor=colors.whitesmoke
+    )
+    body_style = ParagraphStyle(
+        'SheetCell',
+        fontName='Helvetica',
+        fontSize=8,
+        leading=10
+    )
+    return header_style, body_style
+
+
+# Options for every reportlab document written here: deflate page streams
+# even if a local reportlab config turns it off, and write deterministic
+# output (fixed timestamps/IDs) so identical input gives identical bytes
+PDF_WRITER_OPTIONS = {'pageCompression': 1, 'invariant': 1}
+
+# Rows per LongTable in the styled sheet-to-PDF path
+SHEET_TABLE_CHUNK_ROWS = 500
+
+# Upper bound on wrapped lines per sheet cell in the styled PDF table
+SHEET_CELL_MAX_LINES = 20
+
+# Sheets with more rows than this skip platypus Table layout and are drawn
+# straight onto the canvas (see _table_to_pdf_fast)
+FAST_TABLE_PDF_MIN_ROWS = 5000
+
+# JPEG quality for PDF page previews
+PDF_PREVIEW_JPEG_QUALITY = 85
+
+# PDFs with at least this many pages are parsed by pdf2docx across processes;
+# below it the pool start-up costs more than it saves
+PDF2DOCX_PARALLEL_MIN_PAGES = 16
+
+
+def _can_parse_pdf_in_parallel():
+    """
+    Whether pdf2docx may start its own process pool here
+    
+    Its multi-processing mode writes pages-N.json into the current directory,
+    so a run needs a private cwd, and chdir is process-wide: only a main
+    thread may do it, never a request thread of a threaded server. A tasks
+    pool worker is already one of CPU_WORKERS processes, so a nested pool
+    there would oversubscribe the CPUs.
+    """
+    return (multiprocessing.parent_process() is None
+            and threading.current_thread() is threading.main_thread())
 
 
 class DocumentConverter:
@@ -48,9 +280,10 @@ class DocumentConverter:
         source_ext = os.path.splitext(input_path)[1].lower().lstrip('.')
         target_format = target_format.lower()
         
-        # Same format - just copy
+        # Same format - just copy. copyfile skips copy2's metadata syscalls and
+        # uses the kernel's zero-copy path (sendfile/copy_file_range) on Linux
         if source_ext == target_format:
-            shutil.copy2(input_path, output_path)
+            shutil.copyfile(input_path, output_path)
             return True
         
         # Route to appropriate converter
@@ -87,7 +320,7 @@ class DocumentConverter:
         elif target_format == 'md':
             return self._docx_to_markdown(input_path, output_path)
         elif target_format == 'docx':
-            shutil.copy2(input_path, output_path)
+            shutil.copyfile(input_path, output_path)
             return True
         else:
             raise ValueError(f"不支援從 DOCX 轉換至 {target_format}")
@@ -100,7 +333,7 @@ class DocumentConverter:
             return self._text_to_docx(input_path, output_path)
         elif target_format in ['txt', 'md']:
             # txt <-> md is essentially a copy (content is the same, extension differs)
-            shutil.copy2(input_path, output_path)
+            shutil.copyfile(input_path, output_path)
             return True
         else:
             raise ValueError(f"不支援從 {source_ext.upper()} 轉換至 {target_format}")
@@ -114,19 +347,21 @@ class DocumentConverter:
         elif target_format == 'xlsx':
             if source_ext == 'xlsm':
                 # xlsm -> xlsx: save without macros
+                from openpyxl import load_workbook
                 wb = load_workbook(input_path, keep_vba=False)
                 wb.save(output_path)
                 return True
             else:
-                shutil.copy2(input_path, output_path)
+                shutil.copyfile(input_path, output_path)
                 return True
         elif target_format == 'xlsm':
             if source_ext == 'xlsm':
-                shutil.copy2(input_path, output_path)
+                shutil.copyfile(input_path, output_path)
                 return True
             else:
                 # xlsx -> xlsm: cannot add macros, just save as xlsm extension
                 # Note: This won't add macros, just changes extension
+                from openpyxl import load_workbook
                 wb = load_workbook(input_path)
                 wb.save(output_path)
                 return True
@@ -136,19 +371,11 @@ class DocumentConverter:
     def _convert_from_csv(self, input_path, output_path, target_format):
         """Convert from CSV to other formats"""
         if target_format == 'pdf':
-            # CSV -> xlsx -> PDF
-            with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as tmp:
-                tmp_xlsx = tmp.name
-            try:
-                self._csv_to_excel(input_path, tmp_xlsx)
-                return self._excel_to_pdf(tmp_xlsx, output_path)
-            finally:
-                if os.path.exists(tmp_xlsx):
-                    os.unlink(tmp_xlsx)
+            return self._csv_to_pdf(input_path, output_path)
         elif target_format == 'xlsx':
             return self._csv_to_excel(input_path, output_path)
         elif target_format == 'csv':
-            shutil.copy2(input_path, output_path)
+            shutil.copyfile(input_path, output_path)
             return True
         else:
             raise ValueError(f"不支援從 CSV 轉換至 {target_format}")
@@ -158,21 +385,20 @@ class DocumentConverter:
     def _docx_to_text(self, input_path, output_path):
         """Extract plain text from DOCX"""
         try:
-            doc = Document(input_path)
-            lines = []
-            
-            for para in doc.paragraphs:
-                lines.append(para.text)
+            from docx import Document
             
-            # Also extract text from tables
-            for table in doc.tables:
-                for row in table.rows:
-                    row_text = '\t'.join(cell.text.strip() for cell in row.cells)
-                    lines.append(row_text)
+            doc = Document(input_path)
             
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(lines))
+            def iter_lines():
+                for para in doc.paragraphs:
+                    yield para.text
+                
+                # Also extract text from tables
+                for table in doc.tables:
+                    for row in table.rows:
+                        yield '\t'.join([cell.text.strip() for cell in row.cells])
             
+            _write_joined(output_path, iter_lines(), '\n')
             return True
         except Exception as e:
             raise Exception(f"DOCX 轉文字失敗: {str(e)}")
@@ -180,7 +406,10 @@ class DocumentConverter:
     def _docx_to_markdown(self, input_path, output_path):
         """Convert DOCX to Markdown (basic conversion)"""
         try:
+            from docx import Document
+            
             doc = Document(input_path)
+            style_names = {}
             lines = []
             
             for para in doc.paragraphs:
@@ -190,7 +419,7 @@ class DocumentConverter:
                     continue
                 
                 # Handle headings
-                style_name = para.style.name if para.style else ''
+                style_name = _docx_style_name(para, style_names)
                 if style_name and 'Heading' in style_name:
                     # Extract heading level
                     level = 1
@@ -201,17 +430,19 @@ class DocumentConverter:
                     lines.append('#' * level + ' ' + text)
                 else:
                     # Check for bold/italic in runs
-                    md_text = ''
+                    parts = []
                     for run in para.runs:
                         run_text = run.text
-                        if run.bold and run.italic:
-                            md_text += f'***{run_text}***'
-                        elif run.bold:
-                            md_text += f'**{run_text}**'
-                        elif run.italic:
-                            md_text += f'*{run_text}*'
+                        bold, italic = run.bold, run.italic
+                        if bold and italic:
+                            parts.append(f'***{run_text}***')
+                        elif bold:
+                            parts.append(f'**{run_text}**')
+                        elif italic:
+                            parts.append(f'*{run_text}*')
                         else:
-                            md_text += run_text
+                            parts.append(run_text)
+                    md_text = ''.join(parts)
                     lines.append(md_text if md_text else text)
             
             with open(output_path, 'w', encoding='utf-8') as f:
@@ -224,45 +455,38 @@ class DocumentConverter:
     def _text_to_docx(self, input_path, output_path):
         """Convert plain text or Markdown to DOCX"""
         try:
-            with open(input_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            from docx import Document
             
             doc = Document()
             
             # Simple markdown parsing
             is_markdown = input_path.lower().endswith('.md')
             
-            for line in content.split('\n'):
-                if not line.strip():
-                    doc.add_paragraph('')
-                    continue
-                
-                if is_markdown:
-                    # Handle markdown headings
-                    if line.startswith('######'):
-                        doc.add_heading(line[6:].strip(), level=6)
-                    elif line.startswith('#####'):
-                        doc.add_heading(line[5:].strip(), level=5)
-                    elif line.startswith('####'):
-                        doc.add_heading(line[4:].strip(), level=4)
-                    elif line.startswith('###'):
-                        doc.add_heading(line[3:].strip(), level=3)
-                    elif line.startswith('##'):
-                        doc.add_heading(line[2:].strip(), level=2)
-                    elif line.startswith('#'):
-                        doc.add_heading(line[1:].strip(), level=1)
-                    elif line.startswith('- ') or line.startswith('* '):
-                        # List item
-                        doc.add_paragraph(line[2:], style='List Bullet')
-                    elif line.startswith('```'):
-                        # Skip code block markers
+            # Read line by line; the whole file is never held as one string
+            with open(input_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.rstrip('\n')
+                    if not line.strip():
+                        doc.add_paragraph('')
                         continue
+                    
+                    if is_markdown:
+                        # Handle markdown headings (count leading '#' in one scan)
+                        level = min(len(line) - len(line.lstrip('#')), 6)
+                        if level:
+                            doc.add_heading(line[level:].strip(), level=level)
+                        elif line.startswith('- ') or line.startswith('* '):
+                            # List item
+                            doc.add_paragraph(line[2:], style='List Bullet')
+                        elif line.startswith('```'):
+                            # Skip code block markers
+                            continue
+                        else:
+                            # Regular paragraph - handle bold/italic
+                            para = doc.add_paragraph()
+                            self._parse_md_inline(para, line)
                     else:
-                        # Regular paragraph - handle bold/italic
-                        para = doc.add_paragraph()
-                        self._parse_md_inline(para, line)
-                else:
-                    doc.add_paragraph(line)
+                        doc.add_paragraph(line)
             
             doc.save(output_path)
             return True
@@ -270,94 +494,79 @@ class DocumentConverter:
             raise Exception(f"文字轉 DOCX 失敗: {str(e)}")
     
     def _parse_md_inline(self, para, text):
-        """Parse markdown inline formatting (bold, italic) into docx runs"""
-        import re
-        
-        # Simple approach: just add plain text for now
-        # More sophisticated parsing would require proper tokenization
-        remaining = text
-        
-        # Try to find bold text
-        bold_pattern = re.compile(r'\*\*(.+?)\*\*')
-        italic_pattern = re.compile(r'\*([^*]+?)\*')
-        
-        pos = 0
-        for match in bold_pattern.finditer(text):
-            # Add text before match
-            if match.start() > pos:
-                para.add_run(text[pos:match.start()])
-            # Add bold text
-            run = para.add_run(match.group(1))
-            run.bold = True
-            pos = match.end()
-        
-        # Add remaining text
-        if pos < len(text):
-            para.add_run(text[pos:])
+        """Parse markdown inline formatting (bold/italic) into docx runs"""
+        # Plain tokens are buffered so adjacent ones become a single run
+        plain = []
+        for match in _MD_INLINE.finditer(text):
+            group = match.lastindex
+            if group == 4:
+                plain.append(match.group(4))
+                continue
+            
+            if plain:
+                para.add_run(''.join(plain))
+                plain.clear()
+            run = para.add_run(match.group(group))
+            bold, italic = _MD_INLINE_STYLE[group]
+            if bold:
+                run.bold = True
+            if italic:
+                run.italic = True
+        
+        if plain:
+            para.add_run(''.join(plain))
     
     def _text_to_pdf(self, input_path, output_path):
         """Convert text/markdown to PDF"""
         try:
-            from reportlab.lib import colors
             from reportlab.lib.pagesizes import A4
             from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
             from reportlab.lib.units import inch
             
-            with open(input_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
             doc = SimpleDocTemplate(
                 output_path,
                 pagesize=A4,
                 rightMargin=72,
                 leftMargin=72,
                 topMargin=72,
-                bottomMargin=72
+                bottomMargin=72,
+                **PDF_WRITER_OPTIONS
             )
             
-            styles = getSampleStyleSheet()
+            styles, heading_styles = _md_pdf_styles()
             story = []
             
-            # Create heading styles
-            heading_styles = {}
-            for i in range(1, 7):
-                heading_styles[i] = ParagraphStyle(
-                    f'MDHeading{i}',
-                    parent=styles['Heading1'],
-                    fontSize=24 - (i * 2),
-                    spaceAfter=12,
-                    spaceBefore=12
-                )
-            
             is_markdown = input_path.lower().endswith('.md')
             
-            for line in content.split('\n'):
-                if not line.strip():
-                    story.append(Spacer(1, 0.1 * inch))
-                    continue
-                
-                # Escape XML characters
-                safe_line = line.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-                
-                if is_markdown:
-                    # Handle headings
-                    if line.startswith('#'):
-                        level = 0
-                        for char in line:
-                            if char == '#':
-                                level += 1
-                            else:
-                                break
-                        level = min(level, 6)
-                        text = safe_line[level:].strip()
-                        story.append(Paragraph(text, heading_styles.get(level, styles['Normal'])))
+            # Loop-invariant lookups bound to locals
+            normal_style = styles['Normal']
+            blank_gap = 0.1 * inch
+            line_gap = 0.05 * inch
+            story_append = story.append
+            story_extend = story.extend
+            
+            with open(input_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.rstrip('\n')
+                    if not line.strip():
+                        story_append(Spacer(1, blank_gap))
+                        continue
+                    
+                    # Escape XML characters
+                    safe_line = line.translate(_XML_ESCAPE)
+                    
+                    if is_markdown:
+                        # Handle headings (count leading '#' in one scan)
+                        level = min(len(line) - len(line.lstrip('#')), 6)
+                        if level:
+                            text = safe_line[level:].strip()
+                            paragraph = Paragraph(text, heading_styles.get(level, normal_style))
+                        else:
+                            paragraph = Paragraph(safe_line, normal_style)
                     else:
-                        story.append(Paragraph(safe_line, styles['Normal']))
-                else:
-                    story.append(Paragraph(safe_line, styles['Normal']))
-                
-                story.append(Spacer(1, 0.05 * inch))
+                        paragraph = Paragraph(safe_line, normal_style)
+                    
+                    story_extend((paragraph, Spacer(1, line_gap)))
             
             doc.build(story)
             return True
@@ -367,17 +576,37 @@ class DocumentConverter:
     def _pdf_to_text(self, input_path, output_path):
         """Extract text from PDF"""
         try:
-            reader = PdfReader(input_path)
-            text_content = []
+            try:
+                import fitz  # PyMuPDF - C engine, much faster than pypdf
+            except ImportError:
+                fitz = None
             
-            for page in reader.pages:
-                text = page.extract_text()
-                if text:
-                    text_content.append(text)
+            # Every page is read; let the kernel fetch the file ahead of the parser
+            prefetch((input_path,))
             
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write('\n\n'.join(text_content))
+            def iter_page_texts():
+                if fitz is not None:
+                    pdf_document = fitz.open(input_path)
+                    try:
+                        for page in pdf_document:
+                            text = page.get_text("text")
+                            if text:
+                                yield text
+                    finally:
+                        pdf_document.close()
+                else:
+                    try:
+                        from pypdf import PdfReader
+                    except ImportError:
+                        from PyPDF2 import PdfReader
+                    reader = PdfReader(input_path)
+                    for page in reader.pages:
+                        text = page.extract_text()
+                        if text:
+                            yield text
             
+            # Pages are written as they are extracted
+            _write_joined(output_path, iter_page_texts(), '\n\n')
             return True
         except Exception as e:
             raise Exception(f"PDF 轉文字失敗: {str(e)}")
@@ -387,17 +616,23 @@ class DocumentConverter:
     def _excel_to_csv(self, input_path, output_path):
         """Convert Excel to CSV (active sheet only)"""
         try:
-            # Check if xlsm and load with keep_vba
-            is_xlsm = input_path.lower().endswith('.xlsm')
-            wb = load_workbook(input_path, keep_vba=is_xlsm, data_only=True)
-            ws = wb.active
-            
-            with open(output_path, 'w', newline='', encoding='utf-8-sig') as f:
-                writer = csv.writer(f)
-                for row in ws.iter_rows(values_only=True):
-                    # Convert None to empty string
-                    row_data = ['' if cell is None else str(cell) for cell in row]
-                    writer.writerow(row_data)
+            from openpyxl import load_workbook
+            
+            # Read-only mode streams rows from the sheet XML without building
+            # cell/style objects (macros are irrelevant when only reading values)
+            wb = load_workbook(input_path, read_only=True, data_only=True)
+            try:
+                ws = wb.active
+                # Read-only sheets stop at the stored <dimension>, which may be
+                # missing or wrong; scan to the real end of the sheet instead
+                ws.reset_dimensions()
+                
+                with open(output_path, 'w', newline='', encoding='utf-8-sig') as f:
+                    # csv.writer already writes None as '' and str()s other
+                    # values, so rows go straight through in one C-level loop
+                    csv.writer(f).writerows(ws.iter_rows(values_only=True))
+            finally:
+                wb.close()
             
             return True
         except Exception as e:
@@ -406,39 +641,39 @@ class DocumentConverter:
     def _csv_to_excel(self, input_path, output_path):
         """Convert CSV to Excel"""
         try:
-            wb = Workbook()
-            ws = wb.active
+            from openpyxl import Workbook
             
-            # Try different encodings
-            encodings = ['utf-8-sig', 'utf-8', 'gbk', 'big5', 'latin1']
-            content = None
+            def coerce(value):
+                # Convert to number if possible; most cells are text, so the
+                # regex rules them out without raising ValueError
+                if not value:
+                    return None
+                if _NUM_RE.fullmatch(value):
+                    return float(value) if '.' in value else int(value)
+                return value
             
-            for encoding in encodings:
+            # Stream records straight from the file. Candidates come from the
+            # 64KB probe; bytes further in that do not decode restart the
+            # sheet with the next encoding
+            for encoding in _candidate_encodings(input_path):
+                # Write-only mode streams rows to the sheet XML as they are appended
+                wb = Workbook(write_only=True)
+                ws = wb.create_sheet()
+                
                 try:
-                    with open(input_path, 'r', encoding=encoding) as f:
-                        content = f.read()
-                    break
+                    with open(input_path, 'r', encoding=encoding, newline='') as f:
+                        for row in csv.reader(f):
+                            ws.append([coerce(value) for value in row])
                 except UnicodeDecodeError:
+                    # Finish the abandoned sheet's XML stream; openpyxl removes
+                    # its temp file at exit
+                    ws.close()
                     continue
+                
+                wb.save(output_path)
+                return True
             
-            if content is None:
-                raise Exception("無法識別 CSV 檔案編碼")
-            
-            # Parse CSV
-            reader = csv.reader(content.splitlines())
-            for row_idx, row in enumerate(reader, 1):
-                for col_idx, value in enumerate(row, 1):
-                    # Try to convert to number if possible
-                    try:
-                        if '.' in value:
-                            ws.cell(row=row_idx, column=col_idx, value=float(value))
-                        else:
-                            ws.cell(row=row_idx, column=col_idx, value=int(value))
-                    except (ValueError, AttributeError):
-                        ws.cell(row=row_idx, column=col_idx, value=value)
-            
-            wb.save(output_path)
-            return True
+            raise Exception("無法識別 CSV 檔案編碼")
         except Exception as e:
             raise Exception(f"CSV 轉 Excel 失敗: {str(e)}")
     
@@ -447,28 +682,71 @@ class DocumentConverter:
     def _pdf_to_word(self, input_path, output_path):
         """Convert PDF to Word document"""
         try:
+            from pdf2docx import Converter as PDFConverter
+            
+            input_path = os.path.abspath(input_path)
+            output_path = os.path.abspath(output_path)
+            
             cv = PDFConverter(input_path)
-            cv.convert(output_path)
-            cv.close()
+            try:
+                if len(cv.fitz_doc) >= PDF2DOCX_PARALLEL_MIN_PAGES and _can_parse_pdf_in_parallel():
+                    try:
+                        self._pdf_to_word_parallel(cv, output_path)
+                        return True
+                    except Exception:
+                        # Older pdf2docx without multi_processing, or no fork/spawn available
+                        logger.warning("Parallel PDF parsing failed, converting sequentially", exc_info=True)
+                        cv.close()
+                        cv = PDFConverter(input_path)
+                cv.convert(output_path)
+            finally:
+                cv.close()
             return True
         except Exception as e:
             raise Exception(f"PDF 轉 Word 失敗: {str(e)}")
     
-    def _pdf_to_image(self, input_path, output_path, image_format):
-        """Convert first page of PDF to image"""
+    def _pdf_to_word_parallel(self, cv, output_path):
+        """Run pdf2docx with page-level multi-processing in a scratch directory"""
+        cpu = max(1, (os.cpu_count() or 1) - 1)
+        
+        with tempfile.TemporaryDirectory() as scratch:
+            cwd = os.getcwd()
+            os.chdir(scratch)
+            try:
+                cv.convert(output_path, multi_processing=True, cpu_count=cpu)
+            finally:
+                os.chdir(cwd)
+    
+    def _pdf_to_image(self, input_path, output_path, image_format, scale=1.5):
+        """
+        Convert first page of PDF to image
+        
+        Args:
+            input_path: Source PDF
+            output_path: Image file to write
+            image_format: 'png', 'jpg' or 'jpeg'
+            scale: Zoom relative to 72 DPI (1.5 = 108 DPI)
+        """
         try:
             import fitz  # PyMuPDF
             
-            pdf_document = fitz.open(input_path)
-            page = pdf_document[0]
-            pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))
+            # Start reading the whole file; MuPDF jumps between the xref and objects
+            prefetch((input_path,))
             
-            if image_format in ['jpg', 'jpeg']:
-                pix.save(output_path, 'jpeg')
-            else:
-                pix.save(output_path, 'png')
-            
-            pdf_document.close()
+            with fitz.open(input_path) as pdf_document:
+                # Opaque RGB: 3 bytes per pixel instead of 4, and no alpha for the encoder
+                pix = pdf_document[0].get_pixmap(
+                    matrix=fitz.Matrix(scale, scale), colorspace=fitz.csRGB, alpha=False
+                )
+                
+                # Both encoders read the pixmap buffer in place, no intermediate copy
+                if image_format in ['jpg', 'jpeg']:
+                    save_jpeg(pix, output_path, PDF_PREVIEW_JPEG_QUALITY)
+                else:
+                    pix.save(output_path, 'png')
+                
+                # Release the pixel buffer before the document is torn down
+                pix = None
             return True
             
         except ImportError:
@@ -478,28 +756,85 @@ class DocumentConverter:
     
     def _word_to_pdf(self, input_path, output_path):
         """Convert Word document to PDF"""
+        convert = _docx2pdf_convert()
         try:
-            from docx2pdf import convert
+            if convert is None:
+                raise RuntimeError("docx2pdf unavailable")
             convert(input_path, output_path)
             return True
         except Exception as e:
-            print(f"docx2pdf failed: {e}")
+            if convert is not None:
+                print(f"docx2pdf failed: {e}")
             try:
                 return self._word_to_pdf_manual(input_path, output_path)
             except Exception as e2:
                 raise Exception(f"Word 轉 PDF 失敗: {str(e2)}")
     
+    @cached_property
+    def _word_pdf_styles(self):
+        """
+        reportlab styles for _word_to_pdf_manual, built once per converter
+        
+        Returns:
+            tuple: (sample stylesheet, heading styles by Word style name,
+                    alignment variants keyed by (id(base style), alignment))
+        """
+        from reportlab.lib import colors
+        from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_JUSTIFY
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        
+        styles = getSampleStyleSheet()
+        
+        heading_styles = {
+            'Heading 1': ParagraphStyle(
+                'CustomHeading1',
+                parent=styles['Heading1'],
+                fontSize=24,
+                textColor=colors.HexColor('#2F5496'),
+                spaceAfter=12,
+                spaceBefore=12,
+                leading=28
+            ),
+            'Heading 2': ParagraphStyle(
+                'CustomHeading2',
+                parent=styles['Heading2'],
+                fontSize=18,
+                textColor=colors.HexColor('#2F5496'),
+                spaceAfter=10,
+                spaceBefore=10,
+                leading=22
+            ),
+            'Heading 3': ParagraphStyle(
+                'CustomHeading3',
+                parent=styles['Heading3'],
+                fontSize=14,
+                textColor=colors.HexColor('#2F5496'),
+                spaceAfter=8,
+                spaceBefore=8,
+                leading=18
+            ),
+        }
+        
+        # Word alignment (center, right, justify) variants of every base style
+        # a paragraph can get; the bases live as long as the converter, so
+        # their ids stay valid
+        aligned_styles = {}
+        for base in (styles['Normal'], styles['Heading1'], *heading_styles.values()):
+            for alignment, name, value in ((1, 'TempCenter', TA_CENTER),
+                                           (2, 'TempRight', TA_RIGHT),
+                                           (3, 'TempJustify', TA_JUSTIFY)):
+                aligned_styles[(id(base), alignment)] = ParagraphStyle(name, parent=base, alignment=value)
+        
+        return styles, heading_styles, aligned_styles
+    
     def _word_to_pdf_manual(self, input_path, output_path):
         """Manual Word to PDF conversion using reportlab"""
         try:
-            from reportlab.lib import colors
             from reportlab.lib.pagesizes import A4
-            from reportlab.platypus import (
-                SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-            )
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
             from reportlab.lib.units import inch
-            from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT, TA_JUSTIFY
+            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+            from docx import Document
+            from docx.table import Table as DocxTable
             
             doc = Document(input_path)
             
@@ -509,132 +844,20 @@ class DocumentConverter:
                 rightMargin=72,
                 leftMargin=72,
                 topMargin=72,
-                bottomMargin=72
+                bottomMargin=72,
+                **PDF_WRITER_OPTIONS
             )
             
-            styles = getSampleStyleSheet()
             story = []
+            style_names = {}
+            flowables = (Paragraph, Spacer, 0.1 * inch)
             
-            heading_styles = {
-                'Heading 1': ParagraphStyle(
-                    'CustomHeading1',
-                    parent=styles['Heading1'],
-                    fontSize=24,
-                    textColor=colors.HexColor('#2F5496'),
-                    spaceAfter=12,
-                    spaceBefore=12,
-                    leading=28
-                ),
-                'Heading 2': ParagraphStyle(
-                    'CustomHeading2',
-                    parent=styles['Heading2'],
-                    fontSize=18,
-                    textColor=colors.HexColor('#2F5496'),
-                    spaceAfter=10,
-                    spaceBefore=10,
-                    leading=22
-                ),
-                'Heading 3': ParagraphStyle(
-                    'CustomHeading3',
-                    parent=styles['Heading3'],
-                    fontSize=14,
-                    textColor=colors.HexColor('#2F5496'),
-                    spaceAfter=8,
-                    spaceBefore=8,
-                    leading=18
-                ),
-            }
-            
-            for para in doc.paragraphs:
-                if not para.text.strip():
-                    story.append(Spacer(1, 0.1 * inch))
-                    continue
-                
-                style_name = para.style.name if para.style else 'Normal'
-                
-                if style_name and style_name.startswith('Heading'):
-                    if style_name in heading_styles:
-                        style = heading_styles[style_name]
-                    elif 'Heading 1' in style_name:
-                        style = heading_styles['Heading 1']
-                    elif 'Heading 2' in style_name:
-                        style = heading_styles['Heading 2']
-                    elif 'Heading 3' in style_name:
-                        style = heading_styles['Heading 3']
-                    else:
-                        style = styles['Heading1']
+            # Paragraphs and tables in document order, in one pass over the body
+            for block in doc.iter_inner_content():
+                if isinstance(block, DocxTable):
+                    self._render_docx_table(story, block)
                 else:
-                    style = styles['Normal']
-                
-                if para.alignment == 1:
-                    style = ParagraphStyle('TempCenter', parent=style, alignment=TA_CENTER)
-                elif para.alignment == 2:
-                    style = ParagraphStyle('TempRight', parent=style, alignment=TA_RIGHT)
-                elif para.alignment == 3:
-                    style = ParagraphStyle('TempJustify', parent=style, alignment=TA_JUSTIFY)
-                
-                formatted_text = ""
-                for run in para.runs:
-                    text = run.text
-                    if not text:
-                        continue
-                    
-                    text = text.replace('&', '&amp;')
-                    text = text.replace('<', '&lt;')
-                    text = text.replace('>', '&gt;')
-                    
-                    if run.bold and run.italic:
-                        text = f"<b><i>{text}</i></b>"
-                    elif run.bold:
-                        text = f"<b>{text}</b>"
-                    elif run.italic:
-                        text = f"<i>{text}</i>"
-                    
-                    if run.underline:
-                        text = f"<u>{text}</u>"
-                    
-                    formatted_text += text
-                
-                if formatted_text.strip():
-                    try:
-                        story.append(Paragraph(formatted_text, style))
-                        story.append(Spacer(1, 0.1 * inch))
-                    except Exception:
-                        story.append(Paragraph(para.text, style))
-                        story.append(Spacer(1, 0.1 * inch))
-            
-            for table in doc.tables:
-                table_data = []
-                for row in table.rows:
-                    row_data = []
-                    for cell in row.cells:
-                        cell_text = cell.text.strip()
-                        row_data.append(cell_text if cell_text else '')
-                    table_data.append(row_data)
-                
-                if table_data:
-                    pdf_table = Table(table_data)
-                    table_style = TableStyle([
-                        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                        ('FONTSIZE', (0, 0), (-1, 0), 10),
-                        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-                        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                        ('FONTSIZE', (0, 1), (-1, -1), 9),
-                        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                        ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-                        ('BOX', (0, 0), (-1, -1), 1, colors.black),
-                        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
-                        ('TOPPADDING', (0, 0), (-1, -1), 6),
-                        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-                        ('LEFTPADDING', (0, 0), (-1, -1), 8),
-                        ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-                        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                    ])
-                    pdf_table.setStyle(table_style)
-                    story.append(pdf_table)
-                    story.append(Spacer(1, 0.2 * inch))
+                    self._render_docx_paragraph(story, block, style_names, flowables)
             
             pdf_doc.build(story)
             return True
@@ -642,77 +865,285 @@ class DocumentConverter:
         except Exception as e:
             raise Exception(f"Word 轉 PDF 失敗: {str(e)}")
     
+    def _render_docx_paragraph(self, story, para, style_names, flowables):
+        """
+        Append a Word paragraph (runs as inline markup) and its spacing to story
+        
+        Args:
+            story: reportlab flowables being built
+            para: python-docx Paragraph
+            style_names: Per-document cache for _docx_style_name
+            flowables: (Paragraph class, Spacer class, gap after a paragraph),
+                       imported once per document by _word_to_pdf_manual
+        """
+        Paragraph, Spacer, para_gap = flowables
+        
+        if not para.text.strip():
+            story.append(Spacer(1, para_gap))
+            return
+        
+        styles, heading_styles, aligned_styles = self._word_pdf_styles
+        style_name = _docx_style_name(para, style_names) or 'Normal'
+        
+        if style_name and style_name.startswith('Heading'):
+            # 'Heading 2', 'Heading 2 Char', ... -> 'Heading 2' style; others -> Heading1
+            match = _DOCX_HEADING.match(style_name)
+            style = heading_styles.get(match.group()) if match else None
+            if style is None:
+                style = styles['Heading1']
+        else:
+            style = styles['Normal']
+        
+        # Word alignment -> derived style, prebuilt per (base style, alignment)
+        if para.alignment in (1, 2, 3):
+            style = aligned_styles[(id(style), para.alignment)]
+        
+        parts = []
+        for run in para.runs:
+            text = run.text
+            if not text:
+                continue
+            
+            text = text.translate(_XML_ESCAPE)
+            
+            if run.bold and run.italic:
+                text = f"<b><i>{text}</i></b>"
+            elif run.bold:
+                text = f"<b>{text}</b>"
+            elif run.italic:
+                text = f"<i>{text}</i>"
+            
+            if run.underline:
+                text = f"<u>{text}</u>"
+            
+            parts.append(text)
+        
+        formatted_text = ''.join(parts)
+        if formatted_text.strip():
+            try:
+                story.extend((Paragraph(formatted_text, style), Spacer(1, para_gap)))
+            except Exception:
+                story.extend((Paragraph(para.text, style), Spacer(1, para_gap)))
+    
+    def _render_docx_table(self, story, table):
+        """Append a Word table (cell text only) and its spacing to story"""
+        from reportlab.platypus import Spacer, Table
+        from reportlab.lib.units import inch
+        
+        table_data = []
+        for row in table.rows:
+            row_data = []
+            for cell in row.cells:
+                cell_text = cell.text.strip()
+                row_data.append(cell_text if cell_text else '')
+            table_data.append(row_data)
+        
+        if table_data:
+            pdf_table = Table(table_data)
+            pdf_table.setStyle(_docx_table_style())
+            story.append(pdf_table)
+            story.append(Spacer(1, 0.2 * inch))
+    
     def _excel_to_pdf(self, input_path, output_path):
         """Convert Excel to PDF with table formatting"""
         try:
-            from reportlab.lib import colors
-            from reportlab.lib.pagesizes import A4, landscape
-            from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
-            from reportlab.lib.units import mm
-            
-            # Handle xlsm files
-            is_xlsm = input_path.lower().endswith('.xlsm')
-            wb = load_workbook(input_path, keep_vba=is_xlsm, data_only=True)
-            ws = wb.active
-            
-            data = []
-            if ws:
-                for row in ws.iter_rows(values_only=True):
-                    row_data = [str(cell)[:100] if cell is not None else '' for cell in row]
-                    data.append(row_data)
+            from openpyxl import load_workbook
+            
+            # Read-only mode: values only, no per-cell style objects (xlsm too)
+            wb = load_workbook(input_path, read_only=True, data_only=True)
+            try:
+                ws = wb.active
+                
+                data = []
+                if ws:
+                    # Ignore the stored <dimension>, as in _excel_to_csv
+                    ws.reset_dimensions()
+                    data = [list(map(_cell_text, row)) for row in ws.iter_rows(values_only=True) if row]
+            finally:
+                wb.close()
             
             if not data:
                 raise Exception("Excel 檔案中沒有資料")
             
-            num_cols = len(data[0]) if data else 0
-            pagesize = landscape(A4) if num_cols > 6 else A4
+            self._table_to_pdf(data, output_path)
+            return True
             
-            doc = SimpleDocTemplate(
-                output_path,
-                pagesize=pagesize,
-                rightMargin=20,
-                leftMargin=20,
-                topMargin=20,
-                bottomMargin=20
-            )
+        except Exception as e:
+            raise Exception(f"Excel 轉 PDF 失敗: {str(e)}")
+    
+    def _csv_to_pdf(self, input_path, output_path):
+        """Convert CSV to PDF, rendering the parsed rows directly"""
+        try:
+            for encoding in _candidate_encodings(input_path):
+                try:
+                    with open(input_path, 'r', encoding=encoding, newline='') as f:
+                        # Blank lines parse as empty records; they have no cells to draw
+                        data = [row for row in csv.reader(f) if row]
+                except UnicodeDecodeError:
+                    continue
+                
+                if not data:
+                    raise Exception("CSV 檔案中沒有資料")
+                
+                self._table_to_pdf(data, output_path)
+                return True
             
-            page_width = pagesize[0] - 40
-            if num_cols > 0:
-                col_width = page_width / num_cols
-                col_width = max(col_width, 30)
-                col_widths = [min(col_width, page_width / num_cols)] * num_cols
-            else:
-                col_widths = None
-            
-            table = Table(data, colWidths=col_widths, repeatRows=1)
-            
-            table_style = TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 8),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
-                ('TOPPADDING', (0, 0), (-1, -1), 6),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-                ('LEFTPADDING', (0, 0), (-1, -1), 6),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ])
+            raise Exception("無法識別 CSV 檔案編碼")
+        except Exception as e:
+            raise Exception(f"CSV 轉 PDF 失敗: {str(e)}")
+    
+    def _table_to_pdf(self, data, output_path):
+        """
+        Render rows of cell strings as a PDF table
+        
+        Args:
+            data: List of rows (lists of strings), first row is the header;
+                  short rows are padded in place
+            output_path: PDF file to write
+        """
+        from reportlab.lib.pagesizes import A4, landscape
+        from reportlab.platypus import SimpleDocTemplate, LongTable, PageBreak, Paragraph
+        
+        # Sheets without a stored dimension can yield ragged rows in
+        # read-only mode (and CSV records vary freely); the PDF table needs
+        # a rectangular grid
+        num_cols = max(len(row) for row in data)
+        for row in data:
+            if len(row) < num_cols:
+                row.extend([''] * (num_cols - len(row)))
+        pagesize = landscape(A4) if num_cols > 6 else A4
+        
+        page_width = pagesize[0] - 40
+        
+        if len(data) > FAST_TABLE_PDF_MIN_ROWS:
+            col_widths = [page_width / num_cols] * num_cols
+            self._table_to_pdf_fast(data, output_path, pagesize, col_widths)
+            return
+        
+        doc = SimpleDocTemplate(
+            output_path,
+            pagesize=pagesize,
+            rightMargin=20,
+            leftMargin=20,
+            topMargin=20,
+            bottomMargin=20,
+            **PDF_WRITER_OPTIONS
+        )
+        
+        if num_cols > 0:
+            col_width = page_width / num_cols
+            col_width = max(col_width, 30)
+            col_widths = [min(col_width, page_width / num_cols)] * num_cols
+        else:
+            col_widths = None
+        
+        if col_widths:
+            # Cells too long for one line wrap inside their column; text past
+            # ~SHEET_CELL_MAX_LINES wrapped lines is cut so a row always fits a page
+            header_style, body_style = _sheet_cell_styles()
+            chars_per_line = max(1, int((col_widths[0] - 12) / (body_style.fontSize * 0.5)))
+            max_chars = chars_per_line * SHEET_CELL_MAX_LINES
             
+            for index, row in enumerate(data):
+                style = body_style if index else header_style
+                for col, value in enumerate(row):
+                    if len(value) > chars_per_line:
+                        if len(value) > max_chars:
+                            value = value[:max_chars - 1] + '\u2026'
+                        row[col] = Paragraph(value.translate(_XML_ESCAPE), style)
+        
+        # Splitting re-measures the rest of a table at every page break, so
+        # one big table costs O(rows^2); bounded chunks keep it linear. Each
+        # chunk starts on a new page under its own header row, and repeatRows
+        # carries the header onto the pages a chunk spills over
+        header, rows = data[0], data[1:]
+        table_style = _sheet_table_style()
+        story = []
+        for start in range(0, max(len(rows), 1), SHEET_TABLE_CHUNK_ROWS):
+            if start:
+                story.append(PageBreak())
+            table = LongTable(
+                [header] + rows[start:start + SHEET_TABLE_CHUNK_ROWS],
+                colWidths=col_widths,
+                repeatRows=1
+            )
             table.setStyle(table_style)
-            doc.build([table])
+            story.append(table)
+        
+        doc.build(story)
+    
+    def _table_to_pdf_fast(self, data, output_path, pagesize, col_widths):
+        """
+        Draw a large table straight onto the canvas
+        
+        Platypus Table lays out and styles every cell before paginating, which
+        dominates the run time for big sheets. Here rows have a fixed height,
+        the header is repeated on each page and the grid is one call per page.
+        
+        Args:
+            data: Rectangular list of rows (strings), first row is the header
+            output_path: PDF file to write
+            pagesize: reportlab page size
+            col_widths: Column widths in points
+        """
+        from itertools import accumulate
+        from reportlab.lib import colors
+        from reportlab.pdfgen import canvas
+        
+        margin = 20
+        font_size = 8
+        padding = 4
+        row_height = font_size + 2 * padding
+        baseline = padding + 2  # Text baseline above the row's bottom edge
+        
+        page_height = pagesize[1]
+        table_width = sum(col_widths)
+        xs = [margin + x for x in accumulate([0] + col_widths)]
+        
+        # Rough Helvetica average glyph width; cells are cut instead of measured
+        max_chars = [max(1, int((w - 2 * padding) / (font_size * 0.55))) for w in col_widths]
+        
+        c = canvas.Canvas(output_path, pagesize=pagesize, **PDF_WRITER_OPTIONS)
+        
+        def draw_cells(row, y, font):
+            c.setFont(font, font_size)
+            for x, limit, value in zip(xs, max_chars, row):
+                if value:
+                    c.drawString(x + padding, y + baseline, value[:limit])
+        
+        def start_page():
+            y = page_height - margin - row_height
+            c.setFillColor(colors.grey)
+            c.rect(margin, y, table_width, row_height, stroke=0, fill=1)
+            c.setFillColor(colors.whitesmoke)
+            draw_cells(data[0], y, 'Helvetica-Bold')
+            c.setFillColor(colors.black)
+            return y, [y + row_height, y]
+        
+        def finish_page(ys):
+            c.setLineWidth(0.5)
+            c.grid(xs, ys)
+        
+        y, ys = start_page()
+        for index, row in enumerate(data[1:]):
+            if y - row_height < margin:
+                finish_page(ys)
+                c.showPage()
+                y, ys = start_page()
             
-            return True
+            y -= row_height
+            ys.append(y)
             
-        except Exception as e:
-            raise Exception(f"Excel 轉 PDF 失敗: {str(e)}")
+            if index % 2:
+                c.setFillColor(colors.lightgrey)
+                c.rect(margin, y, table_width, row_height, stroke=0, fill=1)
+                c.setFillColor(colors.black)
+            draw_cells(row, y, 'Helvetica')
+        
+        finish_page(ys)
+        c.save()
     
-    def batch_convert(self, input_paths, output_dir, target_format):
+    def batch_convert(self, input_paths, output_dir, target_format, max_workers=None):
         """
         Convert multiple documents
         
@@ -720,20 +1151,44 @@ class DocumentConverter:
             input_paths: List of input file paths
             output_dir: Output directory
             target_format: Target format
+            max_workers: Worker processes (default: CPU count)
             
         Returns:
             dict: Results with success/failure for each file
         """
         results = {}
         
-        for input_path in input_paths:
-            try:
+        if not input_paths:
+            return results
+        
+        # Each conversion is independent and CPU-bound; run them on all cores
+        max_workers = min(len(input_paths), max_workers or os.cpu_count() or 1)
+        
+        # Let the kernel read the queued files while workers parse earlier ones
+        prefetch(input_paths[max_workers:])
+        
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = []
+            for input_path in input_paths:
                 filename = os.path.splitext(os.path.basename(input_path))[0]
                 output_path = os.path.join(output_dir, f"{filename}.{target_format}")
-                
-                self.convert(input_path, output_path, target_format)
-                results[input_path] = {'status': 'success', 'output': output_path}
-            except Exception as e:
-                results[input_path] = {'status': 'failed', 'error': str(e)}
+                futures.append((
+                    input_path,
+                    output_path,
+                    executor.submit(_convert_one, input_path, output_path, target_format)
+                ))
+            
+            # Collect in submission order so results keep the input order
+            for input_path, output_path, future in futures:
+                try:
+                    future.result()
+                    results[input_path] = {'status': 'success', 'output': output_path}
+                except Exception as e:
+                    results[input_path] = {'status': 'failed', 'error': str(e)}
         
         return results
+
+
+def _convert_one(input_path, output_path, target_format):
+    """Process-pool entry point for batch_convert (module-level so it can be pickled)"""
+    return DocumentConverter().convert(input_path, output_path, target_format)
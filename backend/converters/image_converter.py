@@ -2,11 +2,47 @@
 Image format converter
 Handles conversions between various image formats
 """
+import io
 import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
 from PIL import Image
 import img2pdf
 
 
+# Modes that carry transparency and are flattened onto white for JPEG/PDF
+ALPHA_MODES = ('RGBA', 'LA', 'P')
+
+# Pillow format names for target extensions that differ from ext.upper()
+PIL_FORMATS = {'jpg': 'JPEG', 'tif': 'TIFF'}
+
+# Box pre-reduction kicks in below 1 / (2 * gap) of the original size (0.25 here);
+# the same default Image.thumbnail uses
+RESIZE_REDUCING_GAP = 2.0
+
+# compress_image quality when the caller passes None and a re-encode is needed
+COMPRESS_DEFAULT_QUALITY = 85
+
+
+def _flatten_alpha(img):
+    """
+    Composite an image with transparency onto a white background
+
+    Args:
+        img: PIL Image in one of ALPHA_MODES
+
+    Returns:
+        PIL Image: RGB image
+    """
+    if img.mode == 'P':
+        img = img.convert('RGBA')
+    background = Image.new('RGB', img.size, (255, 255, 255))
+    # An RGBA/LA image is its own mask (Pillow reads its alpha band in place),
+    # which saves the full-size band copies img.split() would make
+    background.paste(img, mask=img)
+    return background
+
+
 class ImageConverter:
     """Converts between different image formats"""
     
@@ -42,35 +78,27 @@ class ImageConverter:
                 if max_width or max_height:
                     img = self._resize_image(img, max_width, max_height)
                 
-                # Convert RGBA to RGB for formats that don't support transparency
-                if target_format in ['jpg', 'jpeg'] and img.mode in ['RGBA', 'LA', 'P']:
-                    # Create white background
-                    background = Image.new('RGB', img.size, (255, 255, 255))
-                    if img.mode == 'P':
-                        img = img.convert('RGBA')
-                    background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-                    img = background
-                
-                # Ensure correct mode for target format
-                if target_format in ['jpg', 'jpeg']:
-                    if img.mode != 'RGB':
-                        img = img.convert('RGB')
-                elif target_format == 'png':
-                    if img.mode not in ['RGB', 'RGBA']:
-                        img = img.convert('RGBA')
+                pil_format = PIL_FORMATS.get(target_format, target_format.upper())
                 
-                # Save with appropriate settings
+                # Mode handling and save settings per target format
                 save_kwargs = {}
-                if target_format in ['jpg', 'jpeg']:
+                if pil_format == 'JPEG':
+                    # Flatten transparency onto white; JPEG has no alpha
+                    if img.mode in ALPHA_MODES:
+                        img = _flatten_alpha(img)
+                    elif img.mode != 'RGB':
+                        img = img.convert('RGB')
                     save_kwargs['quality'] = quality if quality else 95
                     save_kwargs['optimize'] = True
-                elif target_format == 'png':
+                elif pil_format == 'PNG':
+                    if img.mode not in ['RGB', 'RGBA']:
+                        img = img.convert('RGBA')
                     save_kwargs['optimize'] = True
                     if quality:
                         # PNG compression level (0-9, inverse of quality)
                         save_kwargs['compress_level'] = max(0, min(9, int((100 - quality) / 11)))
                 
-                img.save(output_path, format=target_format.upper(), **save_kwargs)
+                img.save(output_path, format=pil_format, **save_kwargs)
                 return True
                 
         except Exception as e:
@@ -80,33 +108,25 @@ class ImageConverter:
         """Convert image to PDF"""
         try:
             # Open and process image
-            with Image.open(input_path) as img:
+            with Image.open(input_path) as original:
                 # Convert to RGB if necessary
-                if img.mode in ['RGBA', 'LA', 'P']:
-                    background = Image.new('RGB', img.size, (255, 255, 255))
-                    if img.mode == 'P':
-                        img = img.convert('RGBA')
-                    if img.mode in ['RGBA', 'LA']:
-                        background.paste(img, mask=img.split()[-1])
-                        img = background
-                    else:
-                        img = background
-                
-                # Save as temporary RGB image if needed
-                temp_path = None
-                if img.mode != 'RGB':
+                img = original
+                if img.mode in ALPHA_MODES:
+                    img = _flatten_alpha(img)
+                elif img.mode != 'RGB':
                     img = img.convert('RGB')
-                    temp_path = input_path + '.temp.jpg'
-                    img.save(temp_path, 'JPEG')
-                    input_path = temp_path
+                
+                # An untouched image is embedded from its file; a flattened or
+                # converted one is re-encoded to an in-memory JPEG
+                source = input_path
+                if img is not original:
+                    buf = io.BytesIO()
+                    img.save(buf, 'JPEG')
+                    source = buf.getvalue()
             
-            # Convert to PDF using img2pdf
+            # Convert to PDF using img2pdf (accepts a path or encoded image bytes)
             with open(output_path, 'wb') as f:
-                f.write(img2pdf.convert(input_path))
-            
-            # Clean up temp file
-            if temp_path and os.path.exists(temp_path):
-                os.remove(temp_path)
+                f.write(img2pdf.convert(source))
             
             return True
             
@@ -142,7 +162,18 @@ class ImageConverter:
         if ratio < 1:
             new_width = int(width * ratio)
             new_height = int(height * ratio)
-            return img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+            # A JPEG that is not decoded yet can be scaled by 1/2, 1/4 or 1/8 inside
+            # libjpeg's IDCT; keep at least RESIZE_REDUCING_GAP x the target for
+            # LANCZOS to work from (no-op for other formats or loaded images)
+            if img.format == 'JPEG':
+                img.draft(None, (int(new_width * RESIZE_REDUCING_GAP), int(new_height * RESIZE_REDUCING_GAP)))
+            # For large reductions Pillow first box-averages by an integer factor
+            # down to about RESIZE_REDUCING_GAP x the target, so LANCZOS only runs
+            # over that smaller image
+            return img.resize(
+                (new_width, new_height), Image.Resampling.LANCZOS,
+                reducing_gap=RESIZE_REDUCING_GAP
+            )
         
         return img
     
@@ -153,7 +184,8 @@ class ImageConverter:
         Args:
             input_path: Source image file path
             output_path: Output file path
-            quality: Compression quality (1-100)
+            quality: Compression quality (1-100); None keeps a JPEG source as is
+                     when no resize is requested, otherwise COMPRESS_DEFAULT_QUALITY
             max_width: Maximum width for resizing
             max_height: Maximum height for resizing
             
@@ -166,29 +198,32 @@ class ImageConverter:
             with Image.open(input_path) as img:
                 original_format = img.format.lower()
                 
-                # Resize if needed
-                if max_width or max_height:
-                    img = self._resize_image(img, max_width, max_height)
-                
-                # Determine output format (prefer JPG for compression)
-                if original_format in ['png', 'bmp', 'tiff']:
-                    # Convert to JPG for better compression
-                    if img.mode in ['RGBA', 'LA', 'P']:
-                        background = Image.new('RGB', img.size, (255, 255, 255))
-                        if img.mode == 'P':
-                            img = img.convert('RGBA')
-                        if img.mode in ['RGBA', 'LA']:
-                            background.paste(img, mask=img.split()[-1])
-                            img = background
-                    elif img.mode != 'RGB':
-                        img = img.convert('RGB')
-                    
-                    img.save(output_path, 'JPEG', quality=quality, optimize=True)
+                if quality is None and original_format == 'jpeg' and not (max_width or max_height):
+                    # Nothing to change: the source already is the JPEG a
+                    # decode/re-encode round trip would produce, only lossier
+                    shutil.copyfile(input_path, output_path)
                 else:
-                    # Keep original format
-                    if img.mode != 'RGB':
-                        img = img.convert('RGB')
-                    img.save(output_path, 'JPEG', quality=quality, optimize=True)
+                    if quality is None:
+                        quality = COMPRESS_DEFAULT_QUALITY
+                    
+                    # Resize if needed
+                    if max_width or max_height:
+                        img = self._resize_image(img, max_width, max_height)
+                    
+                    # Determine output format (prefer JPG for compression)
+                    if original_format in ['png', 'bmp', 'tiff']:
+                        # Convert to JPG for better compression
+                        if img.mode in ALPHA_MODES:
+                            img = _flatten_alpha(img)
+                        elif img.mode != 'RGB':
+                            img = img.convert('RGB')
+                        
+                        img.save(output_path, 'JPEG', quality=quality, optimize=True)
+                    else:
+                        # Keep original format
+                        if img.mode != 'RGB':
+                            img = img.convert('RGB')
+                        img.save(output_path, 'JPEG', quality=quality, optimize=True)
             
             compressed_size = os.path.getsize(output_path)
             compression_ratio = (1 - compressed_size / original_size) * 100
@@ -204,7 +239,7 @@ class ImageConverter:
         except Exception as e:
             raise Exception(f"Image compression failed: {str(e)}")
     
-    def batch_convert(self, input_paths, output_dir, target_format):
+    def batch_convert(self, input_paths, output_dir, target_format, max_workers=None):
         """
         Convert multiple images
         
@@ -212,20 +247,41 @@ class ImageConverter:
             input_paths: List of input file paths
             output_dir: Output directory
             target_format: Target format
+            max_workers: Worker processes (default: CPU count)
             
         Returns:
             dict: Results with success/failure for each file
         """
         results = {}
         
-        for input_path in input_paths:
-            try:
+        if not input_paths:
+            return results
+        
+        # Each image is an independent decode/encode; run them on all cores
+        max_workers = min(len(input_paths), max_workers or os.cpu_count() or 1)
+        
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = []
+            for input_path in input_paths:
                 filename = os.path.splitext(os.path.basename(input_path))[0]
                 output_path = os.path.join(output_dir, f"{filename}.{target_format}")
-                
-                self.convert(input_path, output_path, target_format)
-                results[input_path] = {'status': 'success', 'output': output_path}
-            except Exception as e:
-                results[input_path] = {'status': 'failed', 'error': str(e)}
+                futures.append((
+                    input_path,
+                    output_path,
+                    executor.submit(_convert_one, input_path, output_path, target_format)
+                ))
+            
+            # Collect in submission order so results keep the input order
+            for input_path, output_path, future in futures:
+                try:
+                    future.result()
+                    results[input_path] = {'status': 'success', 'output': output_path}
+                except Exception as e:
+                    results[input_path] = {'status': 'failed', 'error': str(e)}
         
         return results
+
+
+def _convert_one(input_path, output_path, target_format):
+    """Process-pool entry point for batch_convert (module-level so it can be pickled)"""
+    return ImageConverter().convert(input_path, output_path, target_format)
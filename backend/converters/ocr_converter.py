@@ -2,14 +2,41 @@
 OCR (Optical Character Recognition) converter
 Extracts text from images and PDFs
 """
+import io
+import multiprocessing
 import os
+import subprocess
+import tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image
 try:
     import pytesseract
-    from pdf2image import convert_from_path
+    from pdf2image import convert_from_path, pdfinfo_from_path
     TESSERACT_AVAILABLE = True
 except ImportError:
     TESSERACT_AVAILABLE = False
+try:
+    import fitz  # PyMuPDF
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
+
+# Page raster resolution for PDF OCR (pdf2image's default, kept for the PyMuPDF path)
+OCR_RENDER_DPI = 200
+
+
+def _ocr_workers():
+    """
+    Tesseract processes to run at once for one PDF
+    
+    A pool worker gets one: the task pool already spans the CPUs, so per-page
+    concurrency there would multiply with the other jobs' processes
+    """
+    if multiprocessing.parent_process() is not None:
+        return 1
+    return os.cpu_count() or 1
 
 
 class OCRConverter:
@@ -59,19 +86,102 @@ class OCRConverter:
             list: List of text strings (one per page)
         """
         try:
-            # Convert PDF pages to images
-            images = convert_from_path(pdf_path)
-            
-            texts = []
-            for i, image in enumerate(images):
-                text = pytesseract.image_to_string(image, lang=lang)
-                texts.append(text)
-            
-            return texts
+            return list(self._iter_pdf_text(pdf_path, lang))
             
         except Exception as e:
             raise Exception(f"PDF OCR failed: {str(e)}")
     
+    def _pdf_page_count(self, pdf_path):
+        """Return the number of pages without rendering any"""
+        if PYMUPDF_AVAILABLE:
+            with fitz.open(pdf_path) as doc:
+                return len(doc)
+        return pdfinfo_from_path(pdf_path)['Pages']
+    
+    def _iter_pdf_text(self, pdf_path, lang):
+        """
+        OCR a PDF page by page
+        
+        Tesseract runs one process per page and only waits on it, so pages are
+        OCR'd concurrently on threads (see _ocr_workers); at most 2x workers
+        rendered pages are held at a time, so memory does not grow with the page count
+        
+        Yields:
+            str: Page text, in page order
+        """
+        max_workers = _ocr_workers()
+        
+        if PYMUPDF_AVAILABLE:
+            yield from self._ocr_pdf_pages(pdf_path, lang, max_workers)
+            return
+        
+        # pdftoppm renders a window of pages per call instead of the whole file
+        page_count = self._pdf_page_count(pdf_path)
+        window = 2 * max_workers
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for first in range(1, page_count + 1, window):
+                images = convert_from_path(
+                    pdf_path, first_page=first, last_page=min(first + window - 1, page_count)
+                )
+                # map() keeps page order
+                yield from executor.map(
+                    lambda image: self._tesseract_stdin(self._encode_pnm(image), lang),
+                    images
+                )
+                images = None
+    
+    def _ocr_pdf_pages(self, pdf_path, lang, max_workers):
+        """
+        OCR a PDF rendered with PyMuPDF, piping each page to Tesseract's stdin
+        
+        Pages are rendered as 8-bit grayscale PGM (Tesseract binarizes gray anyway)
+        and never touch disk: no pdftoppm process, no PIL images, no temp PNGs.
+        Rendering stays on this thread since PyMuPDF is not thread-safe; the
+        Tesseract processes run concurrently.
+        
+        Yields:
+            str: Page text, in page order
+        """
+        pending = deque()
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor, fitz.open(pdf_path) as doc:
+            for page in doc:
+                # Bound the rendered pages waiting for a Tesseract slot
+                if len(pending) >= 2 * max_workers:
+                    yield pending.popleft().result()
+                
+                pix = page.get_pixmap(dpi=OCR_RENDER_DPI, colorspace=fitz.csGRAY, alpha=False)
+                pending.append(executor.submit(self._tesseract_stdin, pix.tobytes('pgm'), lang))
+                pix = None
+            
+            while pending:
+                yield pending.popleft().result()
+    
+    def _encode_pnm(self, image):
+        """Encode a PIL image as PGM/PPM for Tesseract's stdin"""
+        buf = io.BytesIO()
+        image.save(buf, 'PPM')
+        return buf.getvalue()
+    
+    def _tesseract_stdin(self, image_bytes, lang):
+        """
+        Run Tesseract on an encoded image passed through stdin and return its text
+        
+        OMP_THREAD_LIMIT=1 keeps each process single-threaded; concurrency comes
+        from running pages side by side, not from Tesseract's OpenMP threads
+        """
+        proc = subprocess.run(
+            [pytesseract.pytesseract.tesseract_cmd, 'stdin', 'stdout', '-l', lang],
+            input=image_bytes,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=dict(os.environ, OMP_THREAD_LIMIT='1')
+        )
+        if proc.returncode != 0:
+            raise pytesseract.TesseractError(proc.returncode, proc.stderr.decode('utf-8', 'replace').strip())
+        return proc.stdout.decode('utf-8')
+    
     def image_to_searchable_pdf(self, image_path, output_path, lang='eng'):
         """
         Convert image to searchable PDF
@@ -96,6 +206,42 @@ class OCRConverter:
         except Exception as e:
             raise Exception(f"Searchable PDF creation failed: {str(e)}")
     
+    def images_to_searchable_pdf(self, image_paths, output_path, lang='eng'):
+        """
+        Convert several images into one multi-page searchable PDF
+        
+        Tesseract is run once on a list file (one image path per line), so the
+        language model is loaded once instead of once per image
+        
+        Args:
+            image_paths: Image file paths, in page order
+            output_path: Output PDF path
+            lang: Language code
+            
+        Returns:
+            bool: True if successful
+        """
+        list_path = None
+        try:
+            with tempfile.NamedTemporaryFile('w', suffix='.txt', encoding='utf-8', delete=False) as f:
+                list_path = f.name
+                for image_path in image_paths:
+                    f.write(os.path.abspath(image_path) + '\n')
+            
+            # A path is handed to tesseract as-is; a text file is read as an image list
+            pdf = pytesseract.image_to_pdf_or_hocr(list_path, lang=lang, extension='pdf')
+            
+            with open(output_path, 'wb') as f:
+                f.write(pdf)
+            
+            return True
+            
+        except Exception as e:
+            raise Exception(f"Searchable PDF creation failed: {str(e)}")
+        finally:
+            if list_path and os.path.exists(list_path):
+                os.remove(list_path)
+    
     def get_available_languages(self):
         """
         Get list of available OCR languages
@@ -125,25 +271,28 @@ class OCRConverter:
         try:
             if file_type == 'image':
                 text = self.extract_text_from_image(input_path, lang=lang)
+                page_count = 1
                 texts = [text]
             elif file_type == 'pdf':
-                texts = self.extract_text_from_pdf(input_path, lang=lang)
+                # Pages are written as they are recognised, not collected first
+                page_count = self._pdf_page_count(input_path)
+                texts = self._iter_pdf_text(input_path, lang)
             else:
                 raise Exception(f"Unsupported file type: {file_type}")
             
             # Write to output file
+            total_chars = 0
             with open(output_path, 'w', encoding='utf-8') as f:
                 for i, text in enumerate(texts):
-                    if len(texts) > 1:
+                    if page_count > 1:
                         f.write(f"=== Page {i + 1} ===\n\n")
                     f.write(text)
                     f.write("\n\n")
-            
-            total_chars = sum(len(t) for t in texts)
+                    total_chars += len(text)
             
             return {
                 'success': True,
-                'pages': len(texts),
+                'pages': page_count,
                 'total_characters': total_chars,
                 'output_path': output_path
             }
@@ -0,0 +1,142 @@
+"""
+Process-pool tasks for CPU-heavy conversions
+Keeps OCR, PDF rendering and document conversion off the request thread
+"""
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+
+
+# Worker processes for CPU-bound jobs; 0 runs jobs inline on the request thread
+CPU_WORKERS = int(os.environ.get('CPU_WORKERS', os.cpu_count() or 1))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+# Converters are created lazily, once per process (web process and pool workers)
+
+@lru_cache(maxsize=None)
+def get_image_converter():
+    """Return this process's ImageConverter"""
+    from backend.converters.image_converter import ImageConverter
+    return ImageConverter()
+
+
+@lru_cache(maxsize=None)
+def get_document_converter():
+    """Return this process's DocumentConverter"""
+    from backend.converters.document_converter import DocumentConverter
+    return DocumentConverter()
+
+
+@lru_cache(maxsize=None)
+def get_pdf_tools():
+    """Return this process's PDFTools"""
+    from backend.converters.pdf_tools import PDFTools
+    return PDFTools()
+
+
+@lru_cache(maxsize=None)
+def get_ocr_converter():
+    """Return this process's OCRConverter, or None if OCR is not installed"""
+    try:
+        from backend.converters.ocr_converter import OCRConverter
+        return OCRConverter()
+    except Exception:
+        return None
+
+
+def _shrink_mupdf_store():
+    """
+    Empty MuPDF's font/image store once a job is done
+
+    The store is global to the process and keeps objects from documents that
+    are already closed; in a long-lived worker nothing reuses them
+    """
+    fitz = sys.modules.get('fitz')
+    if fitz is not None:
+        fitz.TOOLS.store_shrink(100)
+
+
+def convert_image(input_path, output_path, target_format, quality=None, max_width=None, max_height=None):
+    """Worker entry point for ImageConverter.convert"""
+    return get_image_converter().convert(
+        input_path,
+        output_path,
+        target_format,
+        quality=quality,
+        max_width=max_width,
+        max_height=max_height
+    )
+
+
+def convert_document(input_path, output_path, target_format, **options):
+    """Worker entry point for DocumentConverter.convert (image options are ignored)"""
+    try:
+        return get_document_converter().convert(input_path, output_path, target_format)
+    finally:
+        _shrink_mupdf_store()
+
+
+# /api/convert task per detected format type
+CONVERTER_TASKS = {
+    'image': convert_image,
+    'document': convert_document
+}
+
+
+def pdf_to_images(input_path, output_dir, format='png', dpi=150):
+    """Worker entry point for PDFTools.pdf_to_images"""
+    try:
+        return get_pdf_tools().pdf_to_images(input_path, output_dir, format=format, dpi=dpi)
+    finally:
+        _shrink_mupdf_store()
+
+
+def ocr_to_text_file(input_path, output_path, file_type='image', lang='eng'):
+    """Worker entry point for OCRConverter.ocr_to_text_file"""
+    return get_ocr_converter().ocr_to_text_file(input_path, output_path, file_type=file_type, lang=lang)
+
+
+def _get_pool():
+    """Create the shared process pool on first use"""
+    global _pool
+
+    if CPU_WORKERS <= 0:
+        return None
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=CPU_WORKERS)
+        return _pool
+
+
+def run(task, *args, **kwargs):
+    """
+    Run a task in the process pool and wait for its result
+
+    Args:
+        task: One of the module-level task functions above
+        *args, **kwargs: Arguments passed to the task
+
+    Returns:
+        The task's return value (exceptions are re-raised here)
+    """
+    global _pool
+
+    pool = _get_pool()
+    if pool is None:
+        return task(*args, **kwargs)
+
+    try:
+        return pool.submit(task, *args, **kwargs).result()
+    except BrokenProcessPool:
+        # A worker died (e.g. killed for memory); start a fresh pool next time
+        with _pool_lock:
+            if _pool is pool:
+                _pool = None
+        raise
@@ -3,7 +3,151 @@ File format detection utility
 Automatically detects file formats using magic bytes and extensions
 """
 import os
-import magic
+import struct
+import threading
+import zipfile
+import zlib
+from functools import lru_cache
+try:
+    import magic
+    MAGIC_AVAILABLE = True
+except ImportError:
+    MAGIC_AVAILABLE = False
+
+
+# Detection results kept per FileDetector; the oldest entry goes when full
+DETECT_CACHE_SIZE = 4096
+
+# Bytes read from the start of a file for signature matching; one page, so
+# the first members of an OOXML package usually come with the same read
+HEADER_SIZE = 4096
+
+# (prefix, extension) for the supported binary formats; BMP, RIFF/WEBP and
+# ZIP containers need a second look and are handled in _sniff_header
+_MAGIC_TABLE = (
+    (b'%PDF-', 'pdf'),
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+    (b'\xff\xd8\xff', 'jpg'),
+    (b'GIF87a', 'gif'),
+    (b'GIF89a', 'gif'),
+    (b'II*\x00', 'tiff'),
+    (b'MM\x00*', 'tiff'),
+    (b'\x00\x00\x01\x00', 'ico'),
+)
+
+# BITMAPINFOHEADER sizes (core, v1-v5); 'BM' alone also starts plenty of text
+_BMP_DIB_SIZES = frozenset({12, 40, 52, 56, 64, 108, 124})
+
+# Extensions whose content always carries a signature; a file named like one
+# of these whose header does not match is checked by libmagic before its name is trusted
+SIGNED_FORMATS = frozenset({
+    'pdf', 'png', 'jpg', 'jpeg', 'gif', 'tiff', 'ico', 'bmp', 'webp',
+    'docx', 'xlsx', 'xlsm'
+})
+
+
+# ZIP local file header: signature, flags, method, compressed size, name and extra lengths
+_ZIP_LOCAL_HEADER = struct.Struct('<4s2xHH8xI4xHH')
+
+# Main-part content types in [Content_Types].xml (xlsm before the xlsx substring check)
+_OOXML_CONTENT_TYPES = (
+    (b'wordprocessingml.document.main+xml', 'docx'),
+    (b'ms-excel.sheet.macroEnabled.main+xml', 'xlsm'),
+    (b'spreadsheetml.sheet.main+xml', 'xlsx'),
+)
+
+
+def _sniff_ooxml_head(header):
+    """
+    Classify an OOXML package from the local file headers in its first bytes
+    
+    Decides from [Content_Types].xml when it fits in the header (Word writes it
+    first) or from a word/ member name, without reading the central directory.
+    
+    Returns:
+        str: 'docx', 'xlsx' or 'xlsm', or None if the header does not settle it
+    """
+    pos = 0
+    while pos + _ZIP_LOCAL_HEADER.size <= len(header):
+        fields = _ZIP_LOCAL_HEADER.unpack_from(header, pos)
+        signature, flags, method, compressed_size, name_len, extra_len = fields
+        if signature != b'PK\x03\x04':
+            return None
+        
+        name_start = pos + _ZIP_LOCAL_HEADER.size
+        name = header[name_start:name_start + name_len]
+        data_start = name_start + name_len + extra_len
+        
+        if name == b'[Content_Types].xml':
+            data = header[data_start:data_start + compressed_size]
+            if flags & 0x08 or len(data) < compressed_size or method not in (0, 8):
+                return None
+            try:
+                xml = zlib.decompress(data, -15) if method == 8 else data
+            except zlib.error:
+                return None
+            for marker, ext in _OOXML_CONTENT_TYPES:
+                if marker in xml:
+                    return ext
+            return None
+        
+        if name.startswith(b'word/'):
+            return 'docx'
+        
+        # Bit 3: sizes follow the data, so the next header cannot be located
+        if flags & 0x08:
+            return None
+        pos = data_start + compressed_size
+    
+    return None
+
+
+@lru_cache(maxsize=None)
+def _get_magic():
+    """
+    Return the process-wide libmagic MIME detector (None if not installed)
+    
+    Creating one loads and parses the magic database, so every FileDetector
+    shares a single instance; python-magic serialises calls with its own lock
+    """
+    return magic.Magic(mime=True) if MAGIC_AVAILABLE else None
+
+
+def _sniff_ooxml(file_path):
+    """Tell docx/xlsx/xlsm apart by their ZIP member names"""
+    try:
+        with zipfile.ZipFile(file_path) as zf:
+            names = set(zf.namelist())
+    except (zipfile.BadZipFile, OSError):
+        return None
+    
+    if 'word/document.xml' in names:
+        return 'docx'
+    if 'xl/workbook.xml' in names:
+        return 'xlsm' if 'xl/vbaProject.bin' in names else 'xlsx'
+    return None
+
+
+def _sniff_header(file_path):
+    """
+    Detect a binary format from its leading bytes
+    
+    Returns:
+        str: Extension, or None if no signature matches (text formats never do)
+    """
+    with open(file_path, 'rb', buffering=0) as f:
+        header = f.read(HEADER_SIZE)
+    
+    for prefix, ext in _MAGIC_TABLE:
+        if header.startswith(prefix):
+            return ext
+    if header[:2] == b'BM' and int.from_bytes(header[14:18], 'little') in _BMP_DIB_SIZES:
+        return 'bmp'
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return 'webp'
+    if header.startswith(b'PK\x03\x04'):
+        return _sniff_ooxml_head(header) or _sniff_ooxml(file_path)
+    return None
 
 
 class FileDetector:
@@ -15,6 +159,23 @@ class FileDetector:
         'image': ['png', 'jpg', 'jpeg', 'bmp', 'tiff', 'gif', 'webp', 'ico']
     }
     
+    # Reverse lookup: extension -> format type
+    _EXT_TO_TYPE = {ext: format_type for format_type, exts in SUPPORTED_FORMATS.items() for ext in exts}
+    
+    # Conversion targets
+    _IMAGE_TARGETS = ('png', 'jpg', 'jpeg', 'pdf', 'bmp', 'tiff', 'gif', 'webp', 'ico')
+    _DOCUMENT_TARGETS = {
+        # Word-like formats
+        'pdf': ('docx', 'txt', 'png', 'jpg'),
+        'docx': ('pdf', 'txt', 'md'),
+        'txt': ('pdf', 'docx', 'txt', 'md'),
+        'md': ('pdf', 'docx', 'txt', 'md'),
+        # Excel-like formats
+        'xlsx': ('pdf', 'xlsx', 'csv', 'xlsm'),
+        'xlsm': ('pdf', 'xlsx', 'csv', 'xlsm'),
+        'csv': ('pdf', 'xlsx')
+    }
+    
     MIME_TO_FORMAT = {
         # Documents (modern formats only)
         'application/vnd.openxmlformats-officedocument.wordprocessingml.document': 'docx',
@@ -40,12 +201,18 @@ class FileDetector:
     
     def __init__(self):
         """Initialize the file detector"""
-        self.magic = magic.Magic(mime=True)
+        # path -> ((inode, mtime_ns, size), (format_type, extension)), per detector
+        # instance; a replaced or rewritten file no longer matches its signature
+        self._cache = {}
+        self._cache_lock = threading.Lock()
     
     def detect_format(self, file_path):
         """
         Detect file format automatically
         
+        Results are cached per detector by path and reused while the file's
+        inode, mtime and size are unchanged.
+        
         Args:
             file_path: Path to the file
             
@@ -54,35 +221,71 @@ class FileDetector:
                    format_type: 'document' or 'image'
                    file_extension: detected extension (e.g., 'pdf', 'png')
         """
-        if not os.path.exists(file_path):
+        try:
+            st = os.stat(file_path)
+        except OSError:
             raise FileNotFoundError(f"File not found: {file_path}")
         
-        # Try to detect using magic bytes
+        signature = (st.st_ino, st.st_mtime_ns, st.st_size)
+        with self._cache_lock:
+            cached = self._cache.get(file_path)
+        if cached and cached[0] == signature:
+            return cached[1]
+        
+        result = self._detect(file_path)
+        
+        with self._cache_lock:
+            if len(self._cache) >= DETECT_CACHE_SIZE:
+                # Drop the oldest entry
+                self._cache.pop(next(iter(self._cache)))
+            self._cache[file_path] = (signature, result)
+        return result
+    
+    def forget(self, folder):
+        """Evict cached detections for files under a folder (e.g. a deleted session)"""
+        prefix = os.path.join(folder, '')
+        with self._cache_lock:
+            for path in [p for p in self._cache if p.startswith(prefix)]:
+                del self._cache[path]
+    
+    def _detect(self, file_path):
+        """Uncached detect_format"""
+        # Signatures of the supported binary formats: one short read
         try:
-            mime_type = self.magic.from_file(file_path)
-            detected_ext = self.MIME_TO_FORMAT.get(mime_type)
-            
+            detected_ext = _sniff_header(file_path)
             if detected_ext:
-                format_type = self._get_format_type(detected_ext)
-                return format_type, detected_ext
-        except Exception as e:
-            print(f"Magic detection failed: {e}")
+                return self._get_format_type(detected_ext), detected_ext
+        except OSError as e:
+            print(f"Header detection failed: {e}")
         
-        # Fallback to extension
+        # Extension (text formats have no signature)
         ext = os.path.splitext(file_path)[1].lower().lstrip('.')
-        if ext:
-            format_type = self._get_format_type(ext)
-            if format_type:
-                return format_type, ext
+        format_type = self._get_format_type(ext) if ext else None
+        if format_type and ext not in SIGNED_FORMATS:
+            return format_type, ext
+        
+        # Full libmagic scan for files the header and name do not settle
+        detector = _get_magic()
+        if detector is not None:
+            try:
+                mime_type = detector.from_file(file_path)
+                detected_ext = self.MIME_TO_FORMAT.get(mime_type)
+                
+                if detected_ext:
+                    format_type = self._get_format_type(detected_ext)
+                    return format_type, detected_ext
+            except Exception as e:
+                print(f"Magic detection failed: {e}")
+        
+        # Fallback to extension
+        if format_type:
+            return format_type, ext
         
         raise ValueError("Unable to detect file format")
     
     def _get_format_type(self, extension):
         """Get format type from extension"""
-        for format_type, extensions in self.SUPPORTED_FORMATS.items():
-            if extension in extensions:
-                return format_type
-        return None
+        return self._EXT_TO_TYPE.get(extension)
     
     def get_supported_formats(self):
         """Get all supported formats"""
@@ -100,26 +303,23 @@ class FileDetector:
             list: Available target formats
         """
         if source_format_type == 'image':
-            return ['png', 'jpg', 'jpeg', 'pdf', 'bmp', 'tiff', 'gif', 'webp', 'ico']
+            return list(self._IMAGE_TARGETS)
         elif source_format_type == 'document' and source_format:
-            # Word-like formats
-            if source_format == 'pdf':
-                return ['docx', 'txt', 'png', 'jpg']
-            elif source_format == 'docx':
-                return ['pdf', 'txt', 'md']
-            elif source_format in ['txt', 'md']:
-                return ['pdf', 'docx', 'txt', 'md']
-            # Excel-like formats
-            elif source_format in ['xlsx', 'xlsm']:
-                return ['pdf', 'xlsx', 'csv', 'xlsm']
-            elif source_format == 'csv':
-                return ['pdf', 'xlsx']
-            else:
-                return ['pdf']
+            return list(self._DOCUMENT_TARGETS.get(source_format, ('pdf',)))
         return []
     
     def is_supported(self, file_path):
-        """Check if file format is supported"""
+        """
+        Check if file format is supported
+        
+        A supported extension is taken at its word, without touching the file;
+        only missing or unknown extensions fall back to content detection.
+        Use detect_format when the actual content matters.
+        """
+        ext = os.path.splitext(file_path)[1].lower().lstrip('.')
+        if ext in self._EXT_TO_TYPE:
+            return True
+        
         try:
             self.detect_format(file_path)
             return True
@@ -0,0 +1,35 @@
+"""
+orjson-backed JSON provider for Flask
+Used for jsonify() and request.get_json() when orjson is installed
+"""
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Serializes with orjson; types it does not know go through Flask's default hook"""
+
+    def dumps(self, obj, **kwargs):
+        """
+        Serialize obj to a JSON string
+
+        Args:
+            obj: Data to serialize
+            **kwargs: Flask dump arguments; only indent is honoured
+
+        Returns:
+            str: JSON text (UTF-8, not ASCII-escaped)
+        """
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        """Deserialize JSON text or bytes"""
+        return orjson.loads(s)
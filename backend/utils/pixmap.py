@@ -0,0 +1,24 @@
+"""
+PyMuPDF pixmap encoding helpers
+Shared by the PDF page-to-image paths
+"""
+
+
+def save_jpeg(pix, output_path, quality):
+    """
+    Encode an RGB pixmap (no alpha) as JPEG with Pillow
+
+    Pillow's wheels ship SIMD libjpeg-turbo, several times faster than the
+    libjpeg MuPDF is built with. frombuffer wraps the pixmap's samples in
+    place, so the raster is never copied; the image must not outlive pix.
+
+    Args:
+        pix: fitz.Pixmap rendered with colorspace=csRGB, alpha=False
+        output_path: JPEG file path or writable binary file object
+        quality: JPEG quality (1-95)
+    """
+    # Imported here so importing a converter does not load Pillow
+    from PIL import Image
+    
+    img = Image.frombuffer('RGB', (pix.width, pix.height), pix.samples_mv, 'raw', 'RGB', pix.stride, 1)
+    img.save(output_path, 'JPEG', quality=quality)
@@ -0,0 +1,31 @@
+"""
+Page-cache readahead hints
+Lets the kernel start reading input files before a converter opens them
+"""
+import os
+
+
+def prefetch(paths):
+    """
+    Ask the OS to read files into the page cache in the background
+
+    POSIX only; a no-op where posix_fadvise is unavailable (Windows).
+    Missing or unreadable files are skipped and left for the caller to report.
+
+    Args:
+        paths: Iterable of file paths
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
@@ -5,10 +5,79 @@ Automatically removes old session files
 import os
 import time
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timedelta
 
 
+def _walk_size(path):
+    """
+    Total size of the regular files under a directory
+    
+    Walks with os.scandir: file types come from the directory read itself and
+    one lstat() per file gives its size, with no Path objects in between.
+    Symlinks are neither followed nor counted.
+    """
+    size = 0
+    stack = [path]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    size += entry.stat(follow_symlinks=False).st_size
+    return size
+
+
+# Upper bound on concurrent rmtree calls; deletion is syscall/I-O bound
+CLEANUP_MAX_WORKERS = 8
+
+
+def _remove_session(path):
+    """
+    Delete a session folder in a single walk
+    
+    Each file is sized from its DirEntry and unlinked on the spot, then the
+    emptied directories are removed deepest first. A file that cannot be
+    removed is recorded and the walk carries on, so one bad entry does not
+    leave the rest of the session behind.
+    
+    Returns:
+        tuple: (bytes freed, list of error messages)
+    """
+    freed = 0
+    errors = []
+    dirs = []
+    stack = [path]
+    while stack:
+        current = stack.pop()
+        dirs.append(current)
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                        continue
+                    try:
+                        size = entry.stat(follow_symlinks=False).st_size if entry.is_file(follow_symlinks=False) else 0
+                        os.unlink(entry.path)
+                        freed += size
+                    except OSError as e:
+                        errors.append(f"Failed to remove {entry.path}: {e}")
+        except OSError as e:
+            errors.append(f"Failed to read {current}: {e}")
+    
+    # Parents were pushed before their children
+    for directory in reversed(dirs):
+        try:
+            os.rmdir(directory)
+        except OSError as e:
+            errors.append(f"Failed to remove {directory}: {e}")
+    
+    return freed, errors
+
+
 class SessionCleaner:
     """Handles automatic cleanup of old session files"""
     
@@ -24,6 +93,8 @@ class SessionCleaner:
         self.upload_folder = Path(upload_folder)
         self.output_folder = Path(output_folder)
         self.max_age_hours = max_age_hours
+        # Per folder: {session path: (dir mtime_ns, size)} from the last stats call
+        self._size_cache = {}
     
     def cleanup_old_sessions(self):
         """
@@ -41,11 +112,12 @@ class SessionCleaner:
         
         cutoff_time = time.time() - (self.max_age_hours * 3600)
         
-        # Clean upload folders
-        stats.update(self._clean_folder(self.upload_folder, cutoff_time, 'uploads_cleaned'))
-        
-        # Clean output folders
-        stats.update(self._clean_folder(self.output_folder, cutoff_time, 'outputs_cleaned'))
+        for folder, stat_key in ((self.upload_folder, 'uploads_cleaned'),
+                                 (self.output_folder, 'outputs_cleaned')):
+            result = self._clean_folder(folder, cutoff_time, stat_key)
+            stats[stat_key] = result[stat_key]
+            stats['total_size_freed'] += result['total_size_freed']
+            stats['errors'].extend(result['errors'])
         
         return stats
     
@@ -57,30 +129,37 @@ class SessionCleaner:
             return result
         
         try:
-            for session_dir in folder.iterdir():
-                if not session_dir.is_dir():
-                    continue
-                
-                # Check folder age
-                dir_mtime = session_dir.stat().st_mtime
-                
-                if dir_mtime < cutoff_time:
-                    try:
-                        # Calculate folder size
-                        folder_size = sum(
-                            f.stat().st_size 
-                            for f in session_dir.rglob('*') 
-                            if f.is_file()
-                        )
-                        
-                        # Remove folder
-                        shutil.rmtree(session_dir)
-                        
-                        result[stat_key] += 1
-                        result['total_size_freed'] += folder_size
-                        
-                    except Exception as e:
-                        result['errors'].append(f"Failed to clean {session_dir}: {str(e)}")
+            # DirEntry carries the file type from the directory read, so only
+            # session folders cost a stat() call
+            with os.scandir(folder) as entries:
+                session_dirs = [
+                    entry for entry in entries
+                    if entry.is_dir(follow_symlinks=False)
+                ]
+            
+            # Check folder age
+            expired = [
+                entry.path for entry in session_dirs
+                if entry.stat(follow_symlinks=False).st_mtime < cutoff_time
+            ]
+            
+            if expired:
+                # Sessions are independent, so their deletions can overlap
+                max_workers = min(CLEANUP_MAX_WORKERS, 2 * (os.cpu_count() or 1), len(expired))
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = [(path, executor.submit(_remove_session, path)) for path in expired]
+                    
+                    for session_dir, future in futures:
+                        try:
+                            freed, errors = future.result()
+                        except Exception as e:
+                            result['errors'].append(f"Failed to clean {session_dir}: {str(e)}")
+                            continue
+                        result['total_size_freed'] += freed
+                        if errors:
+                            result['errors'].extend(errors)
+                        else:
+                            result[stat_key] += 1
         
         except Exception as e:
             result['errors'].append(f"Failed to access {folder}: {str(e)}")
@@ -121,22 +200,41 @@ class SessionCleaner:
         return stats
     
     def _get_folder_stats(self, folder):
-        """Get statistics for a specific folder"""
+        """
+        Get statistics for a specific folder
+        
+        Session folders are flat, so adding or removing a file bumps the
+        folder's mtime; a session whose mtime matches the last call reuses
+        its cached size instead of stat()ing every file again. A file
+        overwritten in place under the same name can leave the size stale
+        until the next change to that session.
+        """
         count = 0
         size = 0
+        cache = self._size_cache.get(folder, {})
+        sizes = {}
         
         try:
-            for session_dir in folder.iterdir():
-                if session_dir.is_dir():
-                    count += 1
-                    size += sum(
-                        f.stat().st_size 
-                        for f in session_dir.rglob('*') 
-                        if f.is_file()
-                    )
+            with os.scandir(folder) as entries:
+                session_dirs = [
+                    entry for entry in entries
+                    if entry.is_dir(follow_symlinks=False)
+                ]
+            
+            for entry in session_dirs:
+                mtime = entry.stat(follow_symlinks=False).st_mtime_ns
+                cached = cache.get(entry.path)
+                if cached is None or cached[0] != mtime:
+                    cached = (mtime, _walk_size(entry.path))
+                sizes[entry.path] = cached
+                count += 1
+                size += cached[1]
         except Exception:
             pass
         
+        # Sessions deleted since the last call drop out of the cache
+        self._size_cache[folder] = sizes
+        
         return {'count': count, 'size': size}
     
     def cleanup_specific_session(self, session_id):
@@ -0,0 +1,101 @@
+"""
+Streaming ZIP builder
+Produces a ZIP archive chunk by chunk so batch downloads never touch disk
+"""
+import os
+import zipfile
+
+
+# Size of the reusable read buffer (also the upper bound of a yielded chunk)
+ZIP_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+# Formats that are already compressed internally; deflating them again
+# costs CPU for next to no size reduction, so they are stored as-is
+STORED_EXTENSIONS = frozenset({
+    '.png', '.jpg', '.jpeg', '.gif', '.webp',
+    '.pdf', '.docx', '.xlsx', '.xlsm', '.pptx',
+    '.zip', '.gz'
+})
+
+# Fastest DEFLATE level; text outputs still shrink well and CPU drops sharply
+DEFLATE_LEVEL = 1
+
+
+def _member_info(file_path, arcname):
+    """Build the ZipInfo for a member, choosing compression by extension"""
+    zinfo = zipfile.ZipInfo.from_file(file_path, arcname=arcname)
+    if os.path.splitext(arcname)[1].lower() in STORED_EXTENSIONS:
+        zinfo.compress_type = zipfile.ZIP_STORED
+    else:
+        zinfo.compress_type = zipfile.ZIP_DEFLATED
+        # Public as ZipInfo.compress_level from Python 3.13; the old name is kept as an alias
+        zinfo._compresslevel = DEFLATE_LEVEL
+    return zinfo
+
+
+class _ChunkSink:
+    """Write-only, non-seekable sink that collects ZIP output between yields"""
+
+    def __init__(self):
+        """Initialize the sink"""
+        self._chunks = []
+
+    def write(self, data):
+        """Collect bytes written by ZipFile"""
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        """Nothing to flush; data is handed out by drain()"""
+        pass
+
+    def drain(self):
+        """Return everything written since the last drain"""
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_zip(members):
+    """
+    Build a ZIP archive incrementally
+
+    Already-compressed formats (see STORED_EXTENSIONS) are stored,
+    everything else is deflated at DEFLATE_LEVEL.
+
+    Args:
+        members: Iterable of (file_path, arcname) tuples
+
+    Yields:
+        bytes: Consecutive chunks of the archive
+    """
+    sink = _ChunkSink()
+
+    # One read buffer reused for every member; the sink copies what it keeps
+    buf = bytearray(ZIP_CHUNK_SIZE)
+    view = memoryview(buf)
+
+    # ZipFile falls back to data descriptors when the sink cannot seek,
+    # so each member can be emitted as soon as it is compressed
+    with zipfile.ZipFile(sink, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        for file_path, arcname in members:
+            zinfo = _member_info(file_path, arcname)
+
+            with open(file_path, 'rb', buffering=0) as src, zipf.open(zinfo, 'w') as dst:
+                while True:
+                    n = src.readinto(buf)
+                    if not n:
+                        break
+                    dst.write(view[:n])
+                    chunk = sink.drain()
+                    if chunk:
+                        yield chunk
+
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+
+    # Central directory
+    chunk = sink.drain()
+    if chunk:
+        yield chunk
@@ -144,13 +144,10 @@ async function processFiles(files) {
         let commonTargets = [];
         
         for (const file of files) {
-            // Upload and detect format
-            const formData = new FormData();
-            formData.append('file', file);
-            
-            const response = await fetch('/api/detect', {
-                method: 'POST',
-                body: formData
+            // Upload and detect format (raw body, streamed to disk by the server)
+            const response = await fetch(`/api/detect/${encodeURIComponent(file.name)}`, {
+                method: 'PUT',
+                body: file
             });
             
             const data = await response.json();
@@ -2,22 +2,23 @@
 """
 Quick start script for the web version
 """
+import importlib.util
 import subprocess
 import sys
 import os
 
 def check_dependencies():
-    """Check if required packages are installed"""
-    try:
-        import flask
-        import flask_cors
+    """Check if required packages are installed (located with find_spec, not imported)"""
+    if all(importlib.util.find_spec(module) is not None for module in ('flask', 'flask_cors')):
         print("✓ Dependencies found")
         return True
-    except ImportError:
-        print("✗ Missing dependencies")
-        print("\nInstalling required packages...")
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
-        return True
+    
+    print("✗ Missing dependencies")
+    print("\nInstalling required packages...")
+    subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
+    # Let the import system see packages installed after startup
+    importlib.invalidate_caches()
+    return True
 
 def create_directories():
     """Create necessary directories"""
@@ -43,8 +44,10 @@ def main():
     print("Press Ctrl+C to stop")
     print()
     
-    # Start the app
-    subprocess.call([sys.executable, "app.py"])
+    # Start the app in this interpreter rather than a second one
+    from app import app
+    debug = os.environ.get('FLASK_ENV', 'development') == 'development'
+    app.run(debug=debug, threaded=True, host='0.0.0.0', port=5000)
 
 if __name__ == '__main__':
     main()
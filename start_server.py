@@ -2,26 +2,30 @@
 """
 Quick start script for Document Converter
 """
+import importlib.util
 import os
 import sys
 
 def check_dependencies():
-    """Check if all required dependencies are installed"""
+    """
+    Check if all required dependencies are installed
+    
+    Modules are located with find_spec rather than imported, so the check
+    does not run their top-level code
+    """
     required = {
-        'Flask': 'Flask',
+        'flask': 'Flask',
         'flask_cors': 'Flask-CORS',
         'PIL': 'Pillow',
-        'PyPDF2': 'PyPDF2',
-        'fitz': 'PyMuPDF',
-        'apscheduler': 'APScheduler'
+        'pypdf': 'pypdf',
+        'fitz': 'PyMuPDF'
     }
     
     missing = []
     for module, package in required.items():
-        try:
-            __import__(module)
+        if importlib.util.find_spec(module) is not None:
             print(f"✓ {package}")
-        except ImportError:
+        else:
             print(f"✗ {package} (missing)")
             missing.append(package)
     
@@ -32,10 +36,9 @@ def check_dependencies():
     
     print("\nOptional dependencies:")
     for module, package in optional.items():
-        try:
-            __import__(module)
+        if importlib.util.find_spec(module) is not None:
             print(f"✓ {package}")
-        except ImportError:
+        else:
             print(f"✗ {package} (optional)")
     
     if missing:
@@ -43,6 +46,13 @@ def check_dependencies():
         print("Install with: pip install -r requirements.txt")
         return False
     
+    # JPEG encode/decode speed depends on Pillow's codec build; the official
+    # wheels bundle SIMD libjpeg-turbo, some distro/source builds do not
+    from PIL import features
+    if not features.check_feature('libjpeg_turbo'):
+        print("\n⚠ Pillow is not built with libjpeg-turbo; JPEG conversion will be slower")
+        print("Reinstall the wheel with: pip install --force-reinstall --only-binary :all: Pillow")
+    
     print("\n✓ All required dependencies installed!")
     return True
 
@@ -77,7 +87,10 @@ def main():
     # Import and run Flask app
     try:
         from backend.app import app
-        app.run(debug=True, host='0.0.0.0', port=5000)
+        # Werkzeug serves each request on its own thread; the reloader and
+        # interactive debugger are for development only
+        debug = os.environ.get('FLASK_ENV', 'development') == 'development'
+        app.run(debug=debug, threaded=True, host='0.0.0.0', port=5000)
     except KeyboardInterrupt:
         print("\n\nServer stopped.")
     except Exception as e:
@@ -2,19 +2,22 @@
 Test batch download with actual file creation
 """
 import sys
-import os
+import tempfile
+import zipfile
 from pathlib import Path
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent))
+import pytest
 
+# Add the repository root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import backend.app as backend_app
 from backend.app import app
 import json
 
-def setup_test_files():
+def setup_test_files(output_folder):
     """Create test output files"""
-    output_folder = Path(__file__).parent / 'outputs'
-    test_session = 'test-session-123'
+    test_session = 'testsessionbatchdownload'
     session_folder = output_folder / test_session
     session_folder.mkdir(parents=True, exist_ok=True)
     
@@ -26,9 +29,12 @@ def setup_test_files():
     
     return test_session, test_files
 
-def test_batch_download():
+def test_batch_download(tmp_path, monkeypatch):
     """Test batch download with real files"""
-    test_session, test_files = setup_test_files()
+    # Serve outputs from a temporary folder instead of the app's outputs/
+    monkeypatch.setitem(app.config, 'OUTPUT_FOLDER', tmp_path)
+    monkeypatch.setattr(backend_app, 'OUTPUT_ROOT', str(tmp_path))
+    test_session, test_files = setup_test_files(tmp_path)
     
     with app.test_client() as client:
         # Prepare request data
@@ -38,7 +44,6 @@ def test_batch_download():
         ]
         
         print(f"Testing batch download with {len(files_info)} files...")
-        print(f"Files: {files_info}")
         
         # Make request
         response = client.post(
@@ -47,33 +52,27 @@ def test_batch_download():
             content_type='application/json'
         )
         
-        print(f"\nResponse status: {response.status_code}")
-        print(f"Content type: {response.content_type}")
-        print(f"Content length: {len(response.data)} bytes")
+        print(f"Response status: {response.status_code}")
+        assert response.status_code == 200, response.get_data(as_text=True)
+        assert response.content_type == 'application/zip'
         
-        if response.status_code == 200:
-            print("\nSUCCESS: Batch download endpoint is working!")
-            print(f"ZIP file size: {len(response.data)} bytes")
+        # The archive is streamed; spool it to disk the way a client
+        # would instead of holding the whole body in memory
+        with tempfile.TemporaryFile() as zip_data:
+            chunk_count = 0
+            for chunk in response.iter_encoded():
+                zip_data.write(chunk)
+                chunk_count += 1
+            print(f"ZIP file size: {zip_data.tell()} bytes in {chunk_count} chunks")
             
-            # Verify it's a valid ZIP
-            import zipfile
-            import io
-            try:
-                zip_data = io.BytesIO(response.data)
-                with zipfile.ZipFile(zip_data, 'r') as zipf:
-                    print(f"ZIP contains {len(zipf.namelist())} files:")
-                    for name in zipf.namelist():
-                        print(f"  - {name}")
-            except Exception as e:
-                print(f"ERROR: Invalid ZIP file: {e}")
-        else:
-            print(f"\nERROR: {response.get_json()}")
+            # Verify it's a valid ZIP holding every requested file
+            with zipfile.ZipFile(zip_data, 'r') as zipf:
+                assert zipf.testzip() is None
+                assert sorted(zipf.namelist()) == sorted(test_files)
+                for filename in test_files:
+                    assert zipf.read(filename) == f'Test content for {filename}'.encode()
     
-    # Cleanup
-    import shutil
-    session_folder = Path(__file__).parent / 'outputs' / test_session
-    if session_folder.exists():
-        shutil.rmtree(session_folder)
+    print("✓ Batch download returns every requested file")
 
 if __name__ == '__main__':
-    test_batch_download()
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,95 @@
+"""
+Test text parsing helpers in DocumentConverter
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the repository root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.converters.document_converter import DocumentConverter
+
+# CSV cell -> value written to the sheet by _csv_to_excel
+CSV_CELLS = [
+    ('42', 42),
+    ('-0.5', -0.5),
+    ('+7', 7),
+    ('.5', 0.5),
+    ('5.', 5.0),
+    ('1.5e3', 1500.0),
+    ('007', 7),             # leading zeros are dropped, as int() did
+    ('0.50', 0.5),
+    (' 12 ', 12),           # surrounding spaces, as int() allowed
+    ('1e5', '1e5'),         # int() never took an exponent without a decimal point
+    ('1,000', '1,000'),
+    ('1.2.3', '1.2.3'),
+    ('nan', 'nan'),
+    ('inf', 'inf'),
+    ('0x1F', '0x1F'),
+    ('12abc', '12abc'),
+    ('', None),             # empty cells stay blank
+]
+
+@pytest.fixture(scope='module')
+def csv_sheet_values(tmp_path_factory):
+    """Convert CSV_CELLS (one cell per row) to XLSX and read column A back"""
+    from openpyxl import load_workbook
+    
+    tmp = tmp_path_factory.mktemp('csv')
+    csv_path = tmp / 'cells.csv'
+    xlsx_path = tmp / 'cells.xlsx'
+    # Quote every cell so the empty one still makes a row
+    csv_path.write_text(''.join(f'"{cell}"\n' for cell, _ in CSV_CELLS), encoding='utf-8')
+    
+    DocumentConverter()._csv_to_excel(str(csv_path), str(xlsx_path))
+    
+    wb = load_workbook(xlsx_path, read_only=True)
+    try:
+        return [row[0] if row else None for row in wb.active.iter_rows(values_only=True)]
+    finally:
+        wb.close()
+
+@pytest.mark.parametrize('index, cell, expected', [
+    (index, cell, expected) for index, (cell, expected) in enumerate(CSV_CELLS)
+])
+def test_csv_number_coercion(csv_sheet_values, index, cell, expected):
+    """Only integer and decimal cells become numbers; everything else stays text"""
+    value = csv_sheet_values[index]
+    assert value == expected
+    # Compare kinds, not types: the sheet stores 5.0 as 5
+    assert isinstance(value, str) == isinstance(expected, str)
+
+# Markdown inline text -> (text, bold, italic) runs from _parse_md_inline
+MD_INLINE_CASES = [
+    ('plain text', [('plain text', False, False)]),
+    ('**bold** and *italic*', [('bold', True, False), (' and ', False, False), ('italic', False, True)]),
+    ('***both***', [('both', True, True)]),
+    # Nested spans: the outer one wins and the inner markers stay literal
+    ('**a *b* c**', [('a *b* c', True, False)]),
+    ('*a **b** c*', [('*a ', False, False), ('b', True, False), (' c*', False, False)]),
+    # Unclosed or space-padded markers are plain text
+    ('**unclosed', [('**unclosed', False, False)]),
+    ('*unclosed', [('*unclosed', False, False)]),
+    ('unclosed**', [('unclosed**', False, False)]),
+    ('a * b * c', [('a * b * c', False, False)]),
+    ('**', [('**', False, False)]),
+    # Code spans are kept literal, markers and backticks included
+    ('`a*b*c` and *x*', [('`a*b*c` and ', False, False), ('x', False, True)]),
+    ('`unclosed *x*', [('`unclosed ', False, False), ('x', False, True)]),
+    ('**`code`**', [('`code`', True, False)]),
+]
+
+@pytest.mark.parametrize('text, expected', MD_INLINE_CASES)
+def test_md_inline_runs(text, expected):
+    """Inline markdown becomes docx runs with the right bold/italic flags"""
+    from docx import Document
+    
+    para = Document().add_paragraph()
+    DocumentConverter()._parse_md_inline(para, text)
+    
+    assert [(run.text, bool(run.bold), bool(run.italic)) for run in para.runs] == expected
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
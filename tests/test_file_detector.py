@@ -0,0 +1,136 @@
+"""
+Test format detection in FileDetector
+"""
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+# Add the repository root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.utils.file_detector import FileDetector
+
+def write_image(path, format):
+    """Write a small RGB image in a Pillow format"""
+    Image.new('RGB', (8, 8), (255, 0, 0)).save(path, format)
+
+def write_pdf(path):
+    """Write a minimal PDF"""
+    path.write_bytes(b'%PDF-1.4\n1 0 obj\n<< /Type /Catalog >>\nendobj\ntrailer\n<< /Root 1 0 R >>\n%%EOF\n')
+
+def write_docx(path):
+    """Write an empty Word document with python-docx"""
+    from docx import Document
+    Document().save(path)
+
+def write_xlsx(path):
+    """Write an empty workbook with openpyxl"""
+    from openpyxl import Workbook
+    Workbook().save(path)
+
+def write_ooxml(path, content_type, part):
+    """Write a minimal OOXML package: [Content_Types].xml first, then one part"""
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(
+            '[Content_Types].xml',
+            f'<Types><Override PartName="/{part}" ContentType="application/{content_type}"/></Types>'
+        )
+        zf.writestr(part, '<root/>')
+
+@pytest.mark.parametrize('filename, write, expected', [
+    ('doc.pdf', write_pdf, ('document', 'pdf')),
+    ('pic.png', lambda path: write_image(path, 'PNG'), ('image', 'png')),
+    ('pic.jpg', lambda path: write_image(path, 'JPEG'), ('image', 'jpg')),
+    ('pic.bmp', lambda path: write_image(path, 'BMP'), ('image', 'bmp')),
+    ('doc.docx', write_docx, ('document', 'docx')),
+    ('book.xlsx', write_xlsx, ('document', 'xlsx')),
+    # Decided from [Content_Types].xml in the header alone
+    ('book.xlsx', lambda path: write_ooxml(
+        path, 'vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml', 'xl/workbook.xml'
+    ), ('document', 'xlsx')),
+    ('book.xlsm', lambda path: write_ooxml(
+        path, 'vnd.ms-excel.sheet.macroEnabled.main+xml', 'xl/workbook.xml'
+    ), ('document', 'xlsm')),
+])
+def test_detects_signed_formats(tmp_path, filename, write, expected):
+    """Binary formats are recognised from their headers"""
+    path = tmp_path / filename
+    write(path)
+    
+    assert FileDetector().detect_format(str(path)) == expected
+
+def test_pptx_is_not_taken_for_another_office_format(tmp_path):
+    """A PowerPoint package is not a supported format, and is not mistaken for one"""
+    path = tmp_path / 'slides.pptx'
+    write_ooxml(
+        path,
+        'vnd.openxmlformats-officedocument.presentationml.presentation.main+xml',
+        'ppt/presentation.xml'
+    )
+    
+    with pytest.raises(ValueError):
+        FileDetector().detect_format(str(path))
+
+@pytest.mark.parametrize('filename, content, expected', [
+    ('notes.txt', 'plain text\n', ('document', 'txt')),
+    ('table.csv', 'a,b\n1,2\n', ('document', 'csv')),
+    ('readme.md', '# Title\n', ('document', 'md')),
+])
+def test_unsigned_formats_use_extension(tmp_path, filename, content, expected):
+    """Text formats have no signature and are resolved by extension"""
+    path = tmp_path / filename
+    path.write_text(content)
+    
+    assert FileDetector().detect_format(str(path)) == expected
+
+def test_content_wins_over_mismatched_extension(tmp_path):
+    """A file named like one format but holding another is detected by content"""
+    png_named_jpg = tmp_path / 'photo.jpg'
+    write_image(png_named_jpg, 'PNG')
+    docx_named_pdf = tmp_path / 'report.pdf'
+    write_docx(docx_named_pdf)
+    
+    detector = FileDetector()
+    assert detector.detect_format(str(png_named_jpg)) == ('image', 'png')
+    assert detector.detect_format(str(docx_named_pdf)) == ('document', 'docx')
+
+def test_cache_follows_file_changes(tmp_path):
+    """A rewritten file is detected again instead of served from the cache"""
+    path = tmp_path / 'upload.txt'
+    path.write_text('plain text\n')
+    
+    detector = FileDetector()
+    assert detector.detect_format(str(path)) == ('document', 'txt')
+    
+    write_image(path, 'PNG')
+    assert detector.detect_format(str(path)) == ('image', 'png')
+
+def test_cache_hits_and_forget(tmp_path, monkeypatch):
+    """Repeat lookups are cached until forget() drops the file's folder"""
+    session = tmp_path / 'session'
+    session.mkdir()
+    path = session / 'notes.txt'
+    path.write_text('plain text\n')
+    other = tmp_path / 'other.txt'
+    other.write_text('plain text\n')
+    
+    detector = FileDetector()
+    calls = []
+    detect = detector._detect
+    monkeypatch.setattr(detector, '_detect', lambda file_path: calls.append(file_path) or detect(file_path))
+    
+    for _ in range(2):
+        detector.detect_format(str(path))
+        detector.detect_format(str(other))
+    assert calls == [str(path), str(other)]
+    
+    detector.forget(str(session))
+    detector.detect_format(str(path))
+    detector.detect_format(str(other))
+    assert calls == [str(path), str(other), str(path)]
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,97 @@
+"""
+Test PDF split and merge in PDFTools
+"""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the repository root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.converters import pdf_tools
+from backend.converters.pdf_tools import PDFTools, PdfReader, PdfWriter
+
+def make_pdf(path, page_count):
+    """Write a PDF of blank pages; page N is 100 + N points wide so pages can be told apart"""
+    writer = PdfWriter()
+    for number in range(1, page_count + 1):
+        writer.add_blank_page(width=100 + number, height=100)
+    with open(path, 'wb') as f:
+        writer.write(f)
+    return str(path)
+
+def page_widths(path):
+    """Source page numbers (from make_pdf's widths) of each page in a PDF"""
+    return [int(page.mediabox.width) - 100 for page in PdfReader(path).pages]
+
+def split_names(result):
+    """Output file names of a split_pdf result"""
+    return [os.path.basename(path) for path in result['output_files']]
+
+# Split with PyMuPDF where installed, and with pypdf on both kinds of install
+@pytest.fixture(params=['mupdf', 'pypdf'])
+def tools(request, monkeypatch):
+    """PDFTools using the parametrized split backend"""
+    if request.param == 'mupdf' and not pdf_tools.PYMUPDF_AVAILABLE:
+        pytest.skip('PyMuPDF not installed')
+    if request.param == 'pypdf':
+        monkeypatch.setattr(pdf_tools, 'PYMUPDF_AVAILABLE', False)
+    return PDFTools()
+
+def test_split_single(tmp_path, tools):
+    """'single' writes one file per page, in page order"""
+    source = make_pdf(tmp_path / 'doc.pdf', 3)
+    
+    result = tools.split_pdf(source, str(tmp_path), mode='single')
+    
+    assert result['total_pages'] == 3
+    assert result['file_count'] == 3
+    assert split_names(result) == ['doc_page_1.pdf', 'doc_page_2.pdf', 'doc_page_3.pdf']
+    assert [page_widths(path) for path in result['output_files']] == [[1], [2], [3]]
+
+def test_split_range(tmp_path, tools):
+    """'range' writes every N pages to a part, the last part holding the rest"""
+    source = make_pdf(tmp_path / 'doc.pdf', 5)
+    
+    result = tools.split_pdf(source, str(tmp_path), mode='range', pages=2)
+    
+    assert result['total_pages'] == 5
+    assert split_names(result) == ['doc_part_1.pdf', 'doc_part_2.pdf', 'doc_part_3.pdf']
+    assert [page_widths(path) for path in result['output_files']] == [[1, 2], [3, 4], [5]]
+
+def test_split_pages(tmp_path, tools):
+    """'pages' writes one file per page number or (start, end) range"""
+    source = make_pdf(tmp_path / 'doc.pdf', 5)
+    
+    result = tools.split_pdf(source, str(tmp_path), mode='pages', pages=[2, (3, 5)])
+    
+    assert result['total_pages'] == 5
+    assert split_names(result) == ['doc_page_2.pdf', 'doc_pages_3-5.pdf']
+    assert [page_widths(path) for path in result['output_files']] == [[2], [3, 4, 5]]
+
+def test_merge(tmp_path):
+    """Merged output holds every input's pages, in input order"""
+    first = make_pdf(tmp_path / 'first.pdf', 2)
+    second = make_pdf(tmp_path / 'second.pdf', 3)
+    output = str(tmp_path / 'merged.pdf')
+    
+    result = PDFTools().merge_pdfs([first, second], output)
+    
+    assert result['total_files'] == 2
+    assert result['total_pages'] == 5
+    assert page_widths(output) == [1, 2, 1, 2, 3]
+
+def test_empty_file_is_rejected_as_invalid_pdf(tmp_path):
+    """An empty upload gets pypdf's empty-file error, not mmap's"""
+    empty = tmp_path / 'empty.pdf'
+    empty.write_bytes(b'')
+    
+    with pytest.raises(Exception, match='empty file'):
+        PDFTools().get_pdf_info(str(empty))
+    with pytest.raises(Exception, match='empty file'):
+        PDFTools().merge_pdfs([str(empty), str(empty)], str(tmp_path / 'merged.pdf'))
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))